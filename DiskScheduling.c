@@ -1,7 +1,28 @@
+// Build the program (disksched.native runs it; it is not kept in git, so
+// rebuild it whenever this file changes):
+//   gcc -O2 -o DiskScheduling DiskScheduling.c
+//   gcc -O2 -o DiskScheduling.exe DiskScheduling.c   (Windows, MinGW)
+// Build the reentrant shared library used by disksched.clib (no main(),
+// no global state, safe to call from several threads at once):
+//   gcc -O2 -shared -fPIC -DDISKSCHED_LIBRARY -o libdiskscheduling.so DiskScheduling.c
+//   gcc -O2 -shared -DDISKSCHED_LIBRARY -o DiskScheduling.dll DiskScheduling.c   (Windows)
+
 #include <stdio.h>
 #include <stdlib.h>
 #include <limits.h>
 #include <string.h>
+#include <time.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#include <fcntl.h>
+#include <io.h>
+#else
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
 
 // Disk parameters
 #define RPM 7200          // Disk rotation speed (revolutions per minute)
@@ -10,81 +31,183 @@
 #define SEEK_RATE 0.1     // ms per cylinder seek
 #define TRANSFER_RATE 125 // 1MB/s (1000000 bytes/sec = 125 sectors/ms)
 
-// Global variables
-int disk_size = 200;
-int direction = 1;  // 1 for right, 0 for left
-int i, j;
+// Counting sort is used when the cylinder range is at most this many times n
+#define COUNTING_SORT_FACTOR 16
+
+#if defined(_WIN32) && defined(DISKSCHED_LIBRARY)
+#define DISKSCHED_API __declspec(dllexport)
+#else
+#define DISKSCHED_API
+#endif
+
+// Return codes of run_algorithm
+#define DS_OK 0
+#define DS_UNKNOWN_ALGORITHM -1
+#define DS_OUT_OF_MEMORY -2
+
+// All state is passed explicitly: direction is 1 for right, 0 for left, and
+// the algorithms return -1 instead of a movement if they run out of memory.
 
 // Function prototypes
-int fcfs(int requests[], int n, int head, int* sequence);
-int sstf(int requests[], int n, int head, int* sequence);
-int scan(int requests[], int n, int head, int* sequence);
-int look(int requests[], int n, int head, int* sequence);
-int cscan(int requests[], int n, int head, int* sequence,int direction);
-int clook(int requests[], int n, int head, int* sequence,int direction);
-void sort_array(int arr[], int n);
-
-// Helper function to sort array
-void sort_array(int arr[], int n) {
-    for (i = 0; i < n-1; i++) {
-        for (j = 0; j < n-i-1; j++) {
-            if (arr[j] > arr[j+1]) {
-                int temp = arr[j];
-                arr[j] = arr[j+1];
-                arr[j+1] = temp;
-            }
-        }
+long long fcfs(const int requests[], int n, int head, int* sequence, int* seq_length);
+long long sstf(const int requests[], int n, int head, int* sequence, int* seq_length);
+long long scan(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length);
+long long look(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length);
+long long cscan(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length);
+long long clook(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length);
+void sort_array(int arr[], int n, int disk_size);
+int *sorted_copy(const int requests[], int n, int disk_size);
+DISKSCHED_API int max_sequence_length(int n);
+DISKSCHED_API int run_algorithm(const char *algorithm, const int requests[], int n, int head,
+                                int disk_size, int direction, int *sequence, int *seq_length,
+                                long long *total_movement);
+
+static int compare_int(const void *a, const void *b) {
+    int x = *(const int *)a, y = *(const int *)b;
+    return (x > y) - (x < y);
+}
+
+// Helper function to sort array: counting sort over the cylinder range
+// when it is small compared to n, otherwise qsort
+void sort_array(int arr[], int n, int disk_size) {
+    int i, j;
+    int in_range = disk_size > 0 && disk_size / COUNTING_SORT_FACTOR <= n;
+    for (i = 0; in_range && i < n; i++) {
+        if (arr[i] < 0 || arr[i] >= disk_size) in_range = 0;
+    }
+
+    int *count = in_range ? calloc(disk_size, sizeof(int)) : NULL;
+    if (count == NULL) {
+        qsort(arr, n, sizeof(int), compare_int);
+        return;
     }
+
+    for (i = 0; i < n; i++) count[arr[i]]++;
+    int k = 0;
+    for (i = 0; i < disk_size; i++) {
+        for (j = 0; j < count[i]; j++) arr[k++] = i;
+    }
+    free(count);
+}
+
+// Sorted heap copy of the request list (caller frees; NULL if out of memory)
+int *sorted_copy(const int requests[], int n, int disk_size) {
+    int *sorted = malloc(n * sizeof(int));
+    if (sorted == NULL) return NULL;
+    memcpy(sorted, requests, n * sizeof(int));
+    sort_array(sorted, n, disk_size);
+    return sorted;
+}
+
+// Worst case length of a service sequence: start head, one pass over every
+// request, a disk edge or jump target, and a return pass over every request
+DISKSCHED_API int max_sequence_length(int n) {
+    return 2 * n + 3;
 }
 
 // FCFS implementation
-int fcfs(int requests[], int n, int head, int* sequence) {
-    int total_movement = 0;
+long long fcfs(const int requests[], int n, int head, int* sequence, int* seq_length) {
+    int i;
+    long long total_movement = 0;
     sequence[0] = head;
     for (i = 0; i < n; i++) {
         total_movement += abs(head - requests[i]);
         head = requests[i];
         sequence[i+1] = head;
     }
+    *seq_length = n + 1;
     return total_movement;
 }
 
+typedef struct {
+    int value;
+    int index;
+} request_ref;
+
+static int compare_ref(const void *a, const void *b) {
+    const request_ref *x = a, *y = b;
+    if (x->value != y->value) return (x->value > y->value) - (x->value < y->value);
+    return (x->index > y->index) - (x->index < y->index);
+}
+
 // SSTF implementation
-int sstf(int requests[], int n, int head, int* sequence) {
-    int visited[n];
-    memset(visited, 0, sizeof(visited));
-    int total_movement = 0;
-    sequence[0] = head;
-    
+// Requests are sorted once and grouped by cylinder; the nearest unvisited
+// cylinder is always the one just left or right of the served range, so a
+// two-pointer walk replaces the rescan of every request at each step.
+// Ties go to the cylinder that was requested first, as before.
+long long sstf(const int requests[], int n, int head, int* sequence, int* seq_length) {
+    int i, j;
+    request_ref *refs = malloc(n * sizeof(request_ref));
+    int *groups = malloc((n + 1) * sizeof(int));  // start of each cylinder group
+    if (refs == NULL || groups == NULL) {
+        free(refs);
+        free(groups);
+        return -1;
+    }
     for (i = 0; i < n; i++) {
-        int min_dist = INT_MAX;
-        int min_index = -1;
-        
-        for (j = 0; j < n; j++) {
-            if (!visited[j] && abs(head - requests[j]) < min_dist) {
-                min_dist = abs(head - requests[j]);
-                min_index = j;
-            }
+        refs[i].value = requests[i];
+        refs[i].index = i;
+    }
+    qsort(refs, n, sizeof(request_ref), compare_ref);
+
+    int num_groups = 0;
+    for (i = 0; i < n; i++) {
+        if (i == 0 || refs[i].value != refs[i-1].value) groups[num_groups++] = i;
+    }
+    groups[num_groups] = n;
+
+    // First group at or right of the head
+    int lo = 0, hi = num_groups;
+    while (lo < hi) {
+        int mid = lo + (hi - lo) / 2;
+        if (refs[groups[mid]].value < head) lo = mid + 1;
+        else hi = mid;
+    }
+    int right = lo;
+    int left = lo - 1;
+
+    long long total_movement = 0;
+    int seq_index = 0;
+    sequence[seq_index++] = head;
+
+    while (left >= 0 || right < num_groups) {
+        int pick;
+        if (left < 0) {
+            pick = right;
+        } else if (right >= num_groups) {
+            pick = left;
+        } else {
+            const request_ref *l = &refs[groups[left]];
+            const request_ref *r = &refs[groups[right]];
+            long long dl = (long long)head - l->value;
+            long long dr = (long long)r->value - head;
+            pick = (dl < dr || (dl == dr && l->index < r->index)) ? left : right;
         }
-        
-        if (min_index == -1) break;
-        
-        visited[min_index] = 1;
-        total_movement += min_dist;
-        head = requests[min_index];
-        sequence[i+1] = head;
+
+        int cylinder = refs[groups[pick]].value;
+        total_movement += llabs((long long)head - cylinder);
+        head = cylinder;
+        for (j = groups[pick]; j < groups[pick + 1]; j++) {
+            sequence[seq_index++] = head;
+        }
+
+        if (pick == left) left--;
+        else right++;
     }
-    
+
+    free(refs);
+    free(groups);
+    *seq_length = seq_index;
     return total_movement;
 }
 
 // SCAN (Elevator) implementation
-int scan(int requests[], int n, int head, int* sequence) {
-    int sorted[n];
-    memcpy(sorted, requests, n * sizeof(int));
-    sort_array(sorted, n);
+long long scan(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length) {
+    int i;
+    int *sorted = sorted_copy(requests, n, disk_size);
+    if (sorted == NULL) return -1;
     
-    int total_movement = 0;
+    long long total_movement = 0;
     int seq_index = 0;
     sequence[seq_index++] = head;
     
@@ -128,16 +251,18 @@ int scan(int requests[], int n, int head, int* sequence) {
         }
     }
     
+    free(sorted);
+    *seq_length = seq_index;
     return total_movement;
 }
 
 // LOOK implementation
-int look(int requests[], int n, int head, int* sequence) {
-    int sorted[n];
-    memcpy(sorted, requests, n * sizeof(int));
-    sort_array(sorted, n);
+long long look(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length) {
+    int i;
+    int *sorted = sorted_copy(requests, n, disk_size);
+    if (sorted == NULL) return -1;
     
-    int total_movement = 0;
+    long long total_movement = 0;
     int seq_index = 0;
     sequence[seq_index++] = head;
     
@@ -175,15 +300,17 @@ int look(int requests[], int n, int head, int* sequence) {
         }
     }
     
+    free(sorted);
+    *seq_length = seq_index;
     return total_movement;
 }
 
-int cscan(int requests[], int n, int head, int* sequence, int direction) {
-    int sorted[n];
-    memcpy(sorted, requests, n * sizeof(int));
-    sort_array(sorted, n);
+long long cscan(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length) {
+    int i;
+    int *sorted = sorted_copy(requests, n, disk_size);
+    if (sorted == NULL) return -1;
 
-    int total_movement = 0;
+    long long total_movement = 0;
     int seq_index = 0;
     int initial_head = head;
     sequence[seq_index++] = head;
@@ -250,15 +377,17 @@ int cscan(int requests[], int n, int head, int* sequence, int direction) {
             }
         }
     }
+    free(sorted);
+    *seq_length = seq_index;
     return total_movement;
 }
 
-int clook(int requests[], int n, int head, int* sequence, int direction) {
-    int sorted[n];
-    memcpy(sorted, requests, n * sizeof(int));
-    sort_array(sorted, n);
+long long clook(const int requests[], int n, int head, int disk_size, int direction, int* sequence, int* seq_length) {
+    int i;
+    int *sorted = sorted_copy(requests, n, disk_size);
+    if (sorted == NULL) return -1;
     
-    int total_movement = 0;
+    long long total_movement = 0;
     int seq_index = 0;
     sequence[seq_index++] = head;
     
@@ -309,70 +438,632 @@ int clook(int requests[], int n, int head, int* sequence, int direction) {
         }
     }
     
+    free(sorted);
+    *seq_length = seq_index;
     return total_movement;
 }
 
 
+// Run one algorithm by name.  Returns DS_OK, DS_UNKNOWN_ALGORITHM or
+// DS_OUT_OF_MEMORY; sequence must hold max_sequence_length(n) entries.
+DISKSCHED_API int run_algorithm(const char *algorithm, const int requests[], int n, int head,
+                                int disk_size, int direction, int *sequence, int *seq_length,
+                                long long *total_movement) {
+    if (strcmp(algorithm, "FCFS") == 0) {
+        *total_movement = fcfs(requests, n, head, sequence, seq_length);
+    } else if (strcmp(algorithm, "SSTF") == 0) {
+        *total_movement = sstf(requests, n, head, sequence, seq_length);
+    } else if (strcmp(algorithm, "SCAN") == 0) {
+        *total_movement = scan(requests, n, head, disk_size, direction, sequence, seq_length);
+    } else if (strcmp(algorithm, "LOOK") == 0) {
+        *total_movement = look(requests, n, head, disk_size, direction, sequence, seq_length);
+    } else if (strcmp(algorithm, "C-SCAN") == 0) {
+        *total_movement = cscan(requests, n, head, disk_size, direction, sequence, seq_length);
+    } else if (strcmp(algorithm, "C-LOOK") == 0) {
+        *total_movement = clook(requests, n, head, disk_size, direction, sequence, seq_length);
+    } else {
+        return DS_UNKNOWN_ALGORITHM;
+    }
+    return *total_movement < 0 ? DS_OUT_OF_MEMORY : DS_OK;
+}
+
+
+// Set of cylinders 0..size-1 with successor and predecessor queries, as a
+// 64-way bitset tree (the C twin of disksched.online.CylinderSet): the
+// bottom level has one bit per cylinder and each level above one bit per
+// non-empty word below.  __builtin_ctzll/__builtin_clzll need gcc or clang.
+#define SET_MAX_LEVELS 6  // 64^6 > INT_MAX
+
+typedef struct {
+    int levels;
+    long long size;
+    long long words[SET_MAX_LEVELS];  // words per level
+    unsigned long long *bits[SET_MAX_LEVELS];
+} cylinder_set;
+
+static void set_free(cylinder_set *set) {
+    int k;
+    for (k = 0; k < set->levels; k++) free(set->bits[k]);
+}
+
+static int set_init(cylinder_set *set, int size) {
+    long long n = size > 0 ? size : 1;
+    set->size = size;
+    set->levels = 0;
+    do {
+        n = (n + 63) >> 6;
+        set->words[set->levels] = n;
+        set->bits[set->levels] = calloc((size_t)n, sizeof(unsigned long long));
+        if (set->bits[set->levels++] == NULL) {
+            set_free(set);
+            return -1;
+        }
+    } while (n > 1);
+    return 0;
+}
+
+static void set_add(cylinder_set *set, long long x) {
+    int k;
+    for (k = 0; k < set->levels; k++) {
+        unsigned long long *word = &set->bits[k][x >> 6];
+        int was_empty = *word == 0;
+        *word |= 1ULL << (x & 63);
+        if (!was_empty) return;  // the levels above already know
+        x >>= 6;
+    }
+}
+
+static void set_remove(cylinder_set *set, long long x) {
+    int k;
+    for (k = 0; k < set->levels; k++) {
+        unsigned long long *word = &set->bits[k][x >> 6];
+        *word &= ~(1ULL << (x & 63));
+        if (*word) return;
+        x >>= 6;
+    }
+}
+
+// Smallest member >= x, or -1
+static int set_successor(const cylinder_set *set, long long x) {
+    int k = 0;
+    if (x < 0) x = 0;
+    for (;;) {
+        long long i = x >> 6;
+        if (i >= set->words[k]) return -1;
+        unsigned long long w = set->bits[k][i] >> (x & 63);
+        if (w) {
+            x += __builtin_ctzll(w);
+            break;
+        }
+        x = i + 1;
+        if (++k == set->levels) return -1;
+    }
+    while (k > 0) {  // down along the lowest set bits
+        k--;
+        x = (x << 6) + __builtin_ctzll(set->bits[k][x]);
+    }
+    return (int)x;
+}
+
+// Largest member <= x, or -1
+static int set_predecessor(const cylinder_set *set, long long x) {
+    int k = 0;
+    if (x >= set->size) x = set->size - 1;
+    for (;;) {
+        if (x < 0) return -1;
+        long long i = x >> 6;
+        unsigned long long w = set->bits[k][i] & (~0ULL >> (63 - (x & 63)));
+        if (w) {
+            x = (i << 6) + 63 - __builtin_clzll(w);
+            break;
+        }
+        x = i - 1;
+        if (++k == set->levels) return -1;
+    }
+    while (k > 0) {  // down along the highest set bits
+        k--;
+        x = (x << 6) + 63 - __builtin_clzll(set->bits[k][x]);
+    }
+    return (int)x;
+}
+
+// Discrete-event run of an online policy, the event loop of
+// disksched.simulate: request i arrives at arrivals[i] (ms, ascending) for
+// cylinders[i], and each time the head goes idle the policy picks its next
+// stop among the pending cylinders and serves every request waiting there,
+// in arrival order.  Picks, tie-breaks and timing follow disksched.online
+// step for step.  start[i] and finish[i] (ms) are written in arrival order
+// and path receives every stop, starting at the head (at most n + 1 entries).
+// Handles SSTF, SCAN, LOOK, C-SCAN and C-LOOK; returns DS_OK,
+// DS_UNKNOWN_ALGORITHM or DS_OUT_OF_MEMORY.
+DISKSCHED_API int simulate_queue(const char *algorithm, const int cylinders[], const double arrivals[],
+                                 int n, int head, int disk_size, int direction, double seek_rate,
+                                 double per_request, double start[], double finish[], int *path,
+                                 int *path_length, long long *total_movement) {
+    enum { Q_SSTF, Q_SCAN, Q_LOOK, Q_CSCAN, Q_CLOOK } policy;
+    if (strcmp(algorithm, "SSTF") == 0) policy = Q_SSTF;
+    else if (strcmp(algorithm, "SCAN") == 0) policy = Q_SCAN;
+    else if (strcmp(algorithm, "LOOK") == 0) policy = Q_LOOK;
+    else if (strcmp(algorithm, "C-SCAN") == 0) policy = Q_CSCAN;
+    else if (strcmp(algorithm, "C-LOOK") == 0) policy = Q_CLOOK;
+    else return DS_UNKNOWN_ALGORITHM;
+
+    // Requests pending on each cylinder, as a linked list in arrival order
+    int *first = malloc((size_t)disk_size * sizeof(int));
+    int *last = malloc((size_t)disk_size * sizeof(int));
+    int *next = malloc((size_t)n * sizeof(int));
+    cylinder_set pending;
+    if (first == NULL || last == NULL || next == NULL || set_init(&pending, disk_size) != 0) {
+        free(first);
+        free(last);
+        free(next);
+        return DS_OUT_OF_MEMORY;
+    }
+    int c, j;
+    for (c = 0; c < disk_size; c++) first[c] = -1;
+
+    int to_edge = policy == Q_SCAN || policy == Q_CSCAN;
+    long long edge = disk_size - 1;
+    long long pos = head;
+    long long movement = 0;
+    int admitted = 0, waiting = 0, length = 0;
+    double now = arrivals[0];
+    path[length++] = head;
+
+    for (;;) {
+        while (admitted < n && arrivals[admitted] <= now) {
+            c = cylinders[admitted];
+            next[admitted] = -1;
+            if (first[c] < 0) {
+                first[c] = admitted;
+                set_add(&pending, c);
+            } else {
+                next[last[c]] = admitted;
+            }
+            last[c] = admitted++;
+            waiting++;
+        }
+        if (!waiting) {
+            if (admitted == n) break;
+            now = arrivals[admitted];
+            continue;
+        }
+
+        // Head is idle: pick the next stop among everything pending now
+        long long distance;
+        if (policy == Q_SSTF) {
+            int right = set_successor(&pending, pos);
+            int left = set_predecessor(&pending, pos - 1);
+            // Ties go to whichever was queued first
+            if (right < 0 || (left >= 0 && (pos - left < right - pos ||
+                                            (pos - left == right - pos && first[left] < first[right])))) {
+                c = left;
+                distance = pos - left;
+            } else {
+                c = right;
+                distance = right - pos;
+            }
+        } else if (policy == Q_SCAN || policy == Q_LOOK) {
+            if (direction == 1) {
+                c = set_successor(&pending, pos);
+                if (c >= 0) {
+                    distance = c - pos;
+                } else {
+                    direction = 0;
+                    c = set_predecessor(&pending, edge);
+                    distance = to_edge && pos != edge ? (edge - pos) + (edge - c) : pos - c;
+                }
+            } else {
+                c = set_predecessor(&pending, pos);
+                if (c >= 0) {
+                    distance = pos - c;
+                } else {
+                    direction = 1;
+                    c = set_successor(&pending, 0);
+                    distance = to_edge && pos != 0 ? pos + c : c - pos;
+                }
+            }
+        } else {  // C-SCAN, C-LOOK: one direction, then jump back
+            if (direction == 1) {
+                c = set_successor(&pending, pos);
+                if (c >= 0) {
+                    distance = c - pos;
+                } else {
+                    c = set_successor(&pending, 0);
+                    distance = to_edge ? (edge - pos) + edge + c : pos - c;
+                }
+            } else {
+                c = set_predecessor(&pending, pos);
+                if (c >= 0) {
+                    distance = pos - c;
+                } else {
+                    c = set_predecessor(&pending, edge);
+                    distance = to_edge ? pos + edge + (edge - c) : c - pos;
+                }
+            }
+        }
+
+        set_remove(&pending, c);
+        movement += distance;
+        path[length++] = c;
+        pos = c;
+        double t = now + distance * seek_rate;
+        for (j = first[c]; j >= 0; j = next[j]) {
+            t += per_request;
+            start[j] = now;
+            finish[j] = t;
+            waiting--;
+        }
+        first[c] = -1;
+        now = t;
+    }
+
+    set_free(&pending);
+    free(first);
+    free(last);
+    free(next);
+    *path_length = length;
+    *total_movement = movement;
+    return DS_OK;
+}
+
+#ifndef DISKSCHED_LIBRARY
+
+// Deterministic generator so benchmark workloads are the same on every platform
+static unsigned int bench_state = 2463534242u;
+
+static int bench_random(int bound) {
+    bench_state ^= bench_state << 13;
+    bench_state ^= bench_state >> 17;
+    bench_state ^= bench_state << 5;
+    return (int)(bench_state % (unsigned int)bound);
+}
+
+// Large-n mode: time an algorithm (or ALL) on uniform random workloads of
+// n = 1024, 4096, ... up to max_n.  The growth column is the time ratio to
+// the previous row; with n quadrupling it stays near 4-5 for O(n log n)
+// code, where the old O(n^2) SSTF and bubble sort showed about 16.
+int run_benchmark(const char *algorithm, int max_n, int disk_size) {
+    const char *all[] = {"FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK"};
+    int num_algorithms = 6;
+    if (strcmp(algorithm, "ALL") != 0) {
+        all[0] = algorithm;
+        num_algorithms = 1;
+    }
+
+    int *requests = malloc((size_t)max_n * sizeof(int));
+    int *sequence = malloc((size_t)max_sequence_length(max_n) * sizeof(int));
+    if (requests == NULL || sequence == NULL) {
+        fprintf(stderr, "Out of memory\n");
+        return 1;
+    }
+
+    printf("%-8s %10s %12s %12s %8s\n", "algo", "n", "ms", "ns/request", "growth");
+    for (int a = 0; a < num_algorithms; a++) {
+        double previous_ms = 0;
+        for (int n = 1024; n <= max_n; n *= 4) {
+            bench_state = 2463534242u;
+            for (int k = 0; k < n; k++) requests[k] = bench_random(disk_size);
+
+            long long total_movement;
+            int seq_length;
+            clock_t start = clock();
+            int status = run_algorithm(all[a], requests, n, disk_size / 2, disk_size, 1,
+                                       sequence, &seq_length, &total_movement);
+            if (status != DS_OK) {
+                printf(status == DS_OUT_OF_MEMORY ? "Out of memory\n" : "Unknown algorithm: %s\n", all[a]);
+                free(requests);
+                free(sequence);
+                return 1;
+            }
+            double ms = 1000.0 * (clock() - start) / CLOCKS_PER_SEC;
+
+            printf("%-8s %10d %12.3f %12.1f", all[a], n, ms, ms * 1e6 / n);
+            if (previous_ms > 0) printf(" %8.2f", ms / previous_ms);
+            printf("\n");
+            previous_ms = ms;
+            if (n > max_n / 4) break;
+        }
+    }
+
+    free(requests);
+    free(sequence);
+    return 0;
+}
+
+// Request list, either parsed onto the heap or pointing straight into a
+// memory-mapped binary trace file
+typedef struct {
+    int *requests;
+    int n;
+    int owns_requests;     // requests were malloc'd and must be freed
+    void *view;            // mapped file contents (NULL if not mapped)
+    size_t view_size;
+#ifdef _WIN32
+    HANDLE file, mapping;
+#endif
+} request_list;
+
+static int has_suffix(const char *s, const char *suffix) {
+    size_t ls = strlen(s), lx = strlen(suffix);
+    return ls >= lx && strcmp(s + ls - lx, suffix) == 0;
+}
+
+static int map_file(const char *path, request_list *list) {
+#ifdef _WIN32
+    LARGE_INTEGER size;
+    list->file = CreateFileA(path, GENERIC_READ, FILE_SHARE_READ, NULL, OPEN_EXISTING,
+                             FILE_FLAG_SEQUENTIAL_SCAN, NULL);
+    if (list->file == INVALID_HANDLE_VALUE) return -1;
+    if (!GetFileSizeEx(list->file, &size) || size.QuadPart == 0) {
+        CloseHandle(list->file);
+        return -1;
+    }
+    list->mapping = CreateFileMappingA(list->file, NULL, PAGE_READONLY, 0, 0, NULL);
+    if (list->mapping == NULL) {
+        CloseHandle(list->file);
+        return -1;
+    }
+    list->view = MapViewOfFile(list->mapping, FILE_MAP_READ, 0, 0, 0);
+    if (list->view == NULL) {
+        CloseHandle(list->mapping);
+        CloseHandle(list->file);
+        return -1;
+    }
+    list->view_size = (size_t)size.QuadPart;
+#else
+    struct stat st;
+    int fd = open(path, O_RDONLY);
+    if (fd < 0) return -1;
+    if (fstat(fd, &st) != 0 || st.st_size == 0) {
+        close(fd);
+        return -1;
+    }
+    list->view = mmap(NULL, (size_t)st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+    close(fd);
+    if (list->view == MAP_FAILED) {
+        list->view = NULL;
+        return -1;
+    }
+    list->view_size = (size_t)st.st_size;
+#ifdef MADV_SEQUENTIAL
+    madvise(list->view, list->view_size, MADV_SEQUENTIAL);
+#endif
+#endif
+    return 0;
+}
+
+void free_request_list(request_list *list) {
+    if (list->owns_requests) free(list->requests);
+    if (list->view != NULL) {
+#ifdef _WIN32
+        UnmapViewOfFile(list->view);
+        CloseHandle(list->mapping);
+        CloseHandle(list->file);
+#else
+        munmap(list->view, list->view_size);
+#endif
+    }
+    memset(list, 0, sizeof(*list));
+}
+
+// Parse cylinders out of mapped CSV text.  Any character other than a digit
+// or a leading '-' separates values; '#' starts a comment to end of line.
+// Returns -1 when there are no values, -2 (after reporting it) for a value
+// outside int, -3 when out of memory.
+static int parse_csv(const char *text, size_t size, request_list *list) {
+    size_t capacity = size / 2 + 1;  // every value needs a digit and a separator
+    int *requests = malloc(capacity * sizeof(int));
+    if (requests == NULL) return -3;
+
+    size_t n = 0, k = 0;
+    while (k < size) {
+        char c = text[k];
+        if (c == '#') {
+            while (k < size && text[k] != '\n') k++;
+        } else if ((c >= '0' && c <= '9') || (c == '-' && k + 1 < size && text[k+1] >= '0' && text[k+1] <= '9')) {
+            size_t begin = k;
+            int sign = 1;
+            long long value = 0;
+            if (c == '-') {
+                sign = -1;
+                k++;
+            }
+            // Stops growing once past any int, so it cannot overflow itself
+            while (k < size && text[k] >= '0' && text[k] <= '9') {
+                if (value <= (long long)INT_MAX + 1) value = value * 10 + (text[k] - '0');
+                k++;
+            }
+            value *= sign;
+            if (value > INT_MAX || value < INT_MIN) {
+                fprintf(stderr, "Trace value %.*s does not fit in 32 bits\n", (int)(k - begin), text + begin);
+                free(requests);
+                return -2;
+            }
+            requests[n++] = (int)value;
+        } else {
+            k++;
+        }
+    }
+
+    if (n == 0) {
+        free(requests);
+        return -1;
+    }
+    int *shrunk = realloc(requests, n * sizeof(int));
+    list->requests = shrunk != NULL ? shrunk : requests;
+    list->n = (int)n;
+    list->owns_requests = 1;
+    return 0;
+}
+
+// Load requests from a trace file.  Files ending in .bin or .i32 are packed
+// native int32 cylinders and are used in place without copying; anything
+// else is read as CSV text.
+int load_trace(const char *path, request_list *list) {
+    memset(list, 0, sizeof(*list));
+    if (map_file(path, list) != 0) {
+        fprintf(stderr, "Cannot read trace file: %s\n", path);
+        return -1;
+    }
+
+    if (has_suffix(path, ".bin") || has_suffix(path, ".i32")) {
+        if (list->view_size % sizeof(int) != 0) {
+            fprintf(stderr, "Binary trace size is not a multiple of 4 bytes: %s\n", path);
+            free_request_list(list);
+            return -1;
+        }
+        list->requests = (int *)list->view;
+        list->n = (int)(list->view_size / sizeof(int));
+        return 0;
+    }
+
+    int status = parse_csv((const char *)list->view, list->view_size, list);
+    // Parsed values are on the heap now; release the text mapping early
+    void *view = list->view;
+    list->view = NULL;
+#ifdef _WIN32
+    UnmapViewOfFile(view);
+    CloseHandle(list->mapping);
+    CloseHandle(list->file);
+#else
+    munmap(view, list->view_size);
+#endif
+    if (status != 0) {
+        if (status == -1) fprintf(stderr, "No requests found in trace file: %s\n", path);
+        if (status == -3) fprintf(stderr, "Out of memory\n");
+        return -1;
+    }
+    return 0;
+}
+
+// Binary result format (--binary): this header followed by seq_length
+// native int32 cylinders.  48 bytes, no padding on any common ABI.
+#define RESULT_MAGIC "DSR1"
+
+typedef struct {
+    char magic[4];
+    int seq_length;
+    long long total_movement;
+    double seek_time;
+    double rotational_latency;
+    double transfer_time;
+    double total_time;
+} result_header;
+
+// Compile-time check that the header layout matches the documented 48 bytes
+typedef char result_header_size_check[sizeof(result_header) == 48 ? 1 : -1];
+
+int write_binary_result(const result_header *header, const int *sequence) {
+#ifdef _WIN32
+    _setmode(_fileno(stdout), _O_BINARY);
+#endif
+    if (fwrite(header, sizeof(*header), 1, stdout) != 1) return -1;
+    if (fwrite(sequence, sizeof(int), header->seq_length, stdout) != (size_t)header->seq_length) return -1;
+    return fflush(stdout);
+}
+
 // Main function
 int main(int argc, char *argv[]) {
+    if (argc >= 4 && strcmp(argv[1], "--bench") == 0) {
+        return run_benchmark(argv[2], atoi(argv[3]), argc >= 5 ? atoi(argv[4]) : 200000);
+    }
+
+    int binary_output = 0;
+    if (argc >= 2 && strcmp(argv[1], "--binary") == 0) {
+        binary_output = 1;
+        argv++;
+        argc--;
+    }
+
     if (argc < 6) {
-        printf("Usage: %s <algorithm> <head> <disk_size> <direction> <requests...>\n", argv[0]);
+        printf("Usage: %s [--binary] <algorithm> <head> <disk_size> <direction> <requests...>\n", argv[0]);
+        printf("       %s [--binary] <algorithm> <head> <disk_size> <direction> --trace <file>\n", argv[0]);
+        printf("       %s --bench <algorithm|ALL> <max_n> [disk_size]\n", argv[0]);
         return 1;
     }
 
+    int i;
     char *algorithm = argv[1];
     int head = atoi(argv[2]);
-    disk_size = atoi(argv[3]);
-    direction = atoi(argv[4]);
+    int disk_size = atoi(argv[3]);
+    int direction = atoi(argv[4]);
 
-    int n = argc - 5;
-    int requests[n];
-    for (i = 0; i < n; i++) {
-        requests[i] = atoi(argv[i+5]);
+    request_list list;
+    if (strcmp(argv[5], "--trace") == 0) {
+        if (argc < 7 || load_trace(argv[6], &list) != 0) return 1;
+    } else {
+        memset(&list, 0, sizeof(list));
+        list.n = argc - 5;
+        list.requests = malloc(list.n * sizeof(int));
+        list.owns_requests = 1;
+        if (list.requests == NULL) {
+            fprintf(stderr, "Out of memory\n");
+            return 1;
+        }
+        for (i = 0; i < list.n; i++) {
+            list.requests[i] = atoi(argv[i+5]);
+        }
     }
+    int *requests = list.requests;
+    int n = list.n;
 
-    int sequence[n + 100];  // Enough space for movements
-    memset(sequence, -1, sizeof(sequence));  // Initialize with -1
+    int seq_capacity = max_sequence_length(n);
+    int *sequence = malloc((size_t)seq_capacity * sizeof(int));  // Enough space for movements
+    if (sequence == NULL) {
+        fprintf(stderr, "Out of memory\n");
+        free_request_list(&list);
+        return 1;
+    }
     
-    int total_movement = 0;
-    float seek_time, rotational_latency, transfer_time, total_time;
+    long long total_movement = 0;
+    int seq_length = 0;
+    double seek_time, rotational_latency, transfer_time, total_time;
 
-    if (strcmp(algorithm, "FCFS") == 0) {
-        total_movement = fcfs(requests, n, head, sequence);
-    } else if (strcmp(algorithm, "SSTF") == 0) {
-        total_movement = sstf(requests, n, head, sequence);
-    } else if (strcmp(algorithm, "SCAN") == 0) {
-        total_movement = scan(requests, n, head, sequence);
-    } else if (strcmp(algorithm, "LOOK") == 0) {
-        total_movement = look(requests, n, head, sequence);
-    } else if (strcmp(algorithm, "C-SCAN") == 0) {
-    total_movement = cscan(requests, n, head, sequence, direction);
-	} else if (strcmp(algorithm, "C-LOOK") == 0) {
-    	total_movement = clook(requests, n, head, sequence, direction);
-	}
- else {
-        printf("Unknown algorithm: %s\n", algorithm);
+    int result = run_algorithm(algorithm, requests, n, head, disk_size, direction,
+                               sequence, &seq_length, &total_movement);
+    if (result != DS_OK) {
+        if (result == DS_OUT_OF_MEMORY) fprintf(stderr, "Out of memory\n");
+        else printf("Unknown algorithm: %s\n", algorithm);
+        free(sequence);
+        free_request_list(&list);
         return 1;
     }
 
     // Calculate time components
     seek_time = total_movement * SEEK_RATE;
     rotational_latency = (60.0 * 1000) / (RPM * 2);  // Average rotational latency in ms
-    transfer_time = n * SECTOR_SIZE / (TRANSFER_RATE * 1000.0);  // Transfer time in ms
+    // In double: n * SECTOR_SIZE overflows int from 4,194,304 requests on
+    transfer_time = (double)n * SECTOR_SIZE / (TRANSFER_RATE * 1000.0);  // Transfer time in ms
     total_time = seek_time + rotational_latency + transfer_time;
 
-    // Print output in the required format
-    printf("%d|%.2f|%.2f|%.2f|%.2f|", total_movement, seek_time, 
-           rotational_latency, transfer_time, total_time);
-    
-    // Print sequence (comma-separated without spaces)
-    int seq_length = 0;
-    while (sequence[seq_length] != -1 && seq_length < n + 100) {
-        if (seq_length > 0) printf(",");
-        printf("%d", sequence[seq_length]);
-        seq_length++;
+    int status = 0;
+    if (binary_output) {
+        result_header header;
+        memcpy(header.magic, RESULT_MAGIC, sizeof(header.magic));
+        header.seq_length = seq_length;
+        header.total_movement = total_movement;
+        header.seek_time = seek_time;
+        header.rotational_latency = rotational_latency;
+        header.transfer_time = transfer_time;
+        header.total_time = total_time;
+        status = write_binary_result(&header, sequence) == 0 ? 0 : 1;
+    } else {
+        // Print output in the required format
+        printf("%lld|%.2f|%.2f|%.2f|%.2f|", total_movement, seek_time, 
+               rotational_latency, transfer_time, total_time);
+        
+        // Print sequence (comma-separated without spaces)
+        for (i = 0; i < seq_length; i++) {
+            if (i > 0) printf(",");
+            printf("%d", sequence[i]);
+        }
+        printf("\n");
     }
-    printf("\n");
 
-    return 0;
+    free(sequence);
+    free_request_list(&list);
+    return status;
 }
+
+#endif  // DISKSCHED_LIBRARY
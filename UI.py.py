@@ -1,9 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import functools
+import os
 import random
-import subprocess
+import numpy as np
+from disksched import profiling, validate
+from disksched.cache import ResultCache, requests_digest, result_key
+from disksched.jobs import PARALLEL_MIN_REQUESTS, Job
+from disksched.raid import LEVELS, Layout, merge, simulate_share, split
+from disksched.rotational import DiskModel, timed_schedule
+from disksched.simulate import QUEUES, poisson_arrivals, simulate_summary, summarize
+from disksched.trace import load_trace, parse_request_list
 	
 class DiskSchedulingVisualizer:
     # Disk parameters constants
@@ -11,7 +18,8 @@ class DiskSchedulingVisualizer:
     SECTOR_SIZE = 512     # Bytes per sector
     TRACKS_PER_CYLINDER = 1  # For simplicity
     SEEK_RATE = 0.1       # ms per cylinder seek
-    TRANSFER_RATE = 1     # MB/s
+    TRACK_SIZE = 1000     # Sectors per track
+    JOB_POLL_MS = 50      # How often background job results are collected
 
     def __init__(self, root):
         self.root = root
@@ -29,6 +37,21 @@ class DiskSchedulingVisualizer:
         self.disk_size = 200
         self.direction = 1  # 1 for right, 0 for left
         self.selected_algorithm = "FCFS"
+        self.trace_requests = None  # requests loaded from a trace file
+        self.writes = None  # per-request write flags ('w' suffix), used by DEADLINE
+        self.sectors = None  # per-request sectors ('cyl:sector'), used by SATF and the timing
+        self.trace_label = None
+        self.disk_model = DiskModel(rpm=self.RPM, track_size=self.TRACK_SIZE, seek_rate=self.SEEK_RATE)
+        
+        # Results are reused when the same inputs are run again; set
+        # DISKSCHED_CACHE_DIR to keep them on disk between sessions
+        self.cache = ResultCache(directory=os.environ.get("DISKSCHED_CACHE_DIR"))
+        self.plot_views = []  # zoom-aware views of long sequences (callbacks are weak refs)
+        self.job = None       # background scheduling job, see start_job
+        self.job_handlers = (None, None)
+        self.timings = {}     # rotational AccessTimes of recent runs, see timed_options
+        self.array_result = None  # last RAID simulation, see simulate_array
+        self.profiled_in_workers = False  # last job ran in processes the profile can't see
         
         # Create UI
         self.create_widgets()
@@ -45,13 +68,15 @@ class DiskSchedulingVisualizer:
         
         tk.Label(algo_frame, text="Select Algorithm:").pack(anchor=tk.W)
         self.algo_combo = ttk.Combobox(algo_frame, values=[
-            "FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK"
+            "FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK", "DEADLINE", "SATF"
         ])
         self.algo_combo.pack(fill=tk.X, pady=5)
         self.algo_combo.set("FCFS")
         self.create_tooltip(self.algo_combo, "First-Come First-Served (FCFS)\n"
                            "Shortest Seek Time First (SSTF)\n"
-                           "SCAN (Elevator)\nLOOK\nC-SCAN\nC-LOOK")
+                           "SCAN (Elevator)\nLOOK\nC-SCAN\nC-LOOK\n"
+                           "DEADLINE (elevator with read/write expiry)\n"
+                           "SATF (Shortest Access Time First, seek + rotation)")
         
         # Disk Parameters
         disk_frame = tk.LabelFrame(control_frame, text="Disk Parameters", padx=5, pady=5)
@@ -80,11 +105,53 @@ class DiskSchedulingVisualizer:
         tk.Radiobutton(dir_frame, text="Right (Increasing)", variable=self.direction_var, value=1).pack(anchor=tk.W)
         tk.Radiobutton(dir_frame, text="Left (Decreasing)", variable=self.direction_var, value=0).pack(anchor=tk.W)
         
+        # Deadline tuning; the arrival rate drives the latency columns of Compare All
+        tune_frame = tk.LabelFrame(control_frame, text="Deadline Tuning", padx=5, pady=5)
+        tune_frame.pack(fill=tk.X, pady=5)
+        
+        self.read_expire_var = tk.IntVar(value=500)
+        self.write_expire_var = tk.IntVar(value=5000)
+        self.fifo_batch_var = tk.IntVar(value=16)
+        self.arrival_rate_var = tk.IntVar(value=150)
+        tuning = [
+            ("Read expire (ms):", self.read_expire_var, 1, 60000),
+            ("Write expire (ms):", self.write_expire_var, 1, 60000),
+            ("FIFO batch:", self.fifo_batch_var, 1, 1024),
+            ("Arrivals (req/s):", self.arrival_rate_var, 1, 100000),
+        ]
+        for row, (text, var, low, high) in enumerate(tuning):
+            tk.Label(tune_frame, text=text).grid(row=row, column=0, sticky=tk.W)
+            tk.Spinbox(tune_frame, from_=low, to=high, textvariable=var, width=8).grid(row=row, column=1, sticky=tk.E)
+        
+        # RAID array: requests become logical cylinders striped over the member
+        # disks, each Disk Size cylinders; Show disk picks the plotted member
+        raid_frame = tk.LabelFrame(control_frame, text="RAID Array", padx=5, pady=5)
+        raid_frame.pack(fill=tk.X, pady=5)
+        
+        self.raid_level_var = tk.StringVar(value=str(LEVELS[-1]))
+        self.raid_disks_var = tk.IntVar(value=4)
+        self.raid_chunk_var = tk.IntVar(value=16)
+        self.raid_view_var = tk.IntVar(value=0)
+        tk.Label(raid_frame, text="Level:").grid(row=0, column=0, sticky=tk.W)
+        ttk.Combobox(raid_frame, values=[str(level) for level in LEVELS], textvariable=self.raid_level_var,
+                     width=6, state="readonly").grid(row=0, column=1, sticky=tk.E)
+        raid_settings = [
+            ("Disks:", self.raid_disks_var, 1, 16, None),
+            ("Chunk (cylinders):", self.raid_chunk_var, 1, 500, None),
+            ("Show disk:", self.raid_view_var, 0, 15, self.show_array_disk),
+        ]
+        for row, (text, var, low, high, command) in enumerate(raid_settings, start=1):
+            tk.Label(raid_frame, text=text).grid(row=row, column=0, sticky=tk.W)
+            tk.Spinbox(raid_frame, from_=low, to=high, textvariable=var, width=8,
+                       command=command).grid(row=row, column=1, sticky=tk.E)
+        tk.Button(raid_frame, text="Simulate Array", command=self.simulate_array).grid(
+            row=len(raid_settings) + 1, column=0, columnspan=2, sticky=tk.EW, pady=(5, 0))
+        
         # Request Input
         req_frame = tk.LabelFrame(control_frame, text="Disk Requests", padx=5, pady=5)
         req_frame.pack(fill=tk.X, pady=5)
         
-        tk.Label(req_frame, text="Cylinder Numbers (comma separated):").pack(anchor=tk.W)
+        tk.Label(req_frame, text="Cylinders (comma separated, cyl:sector, 'w' = write):").pack(anchor=tk.W)
         self.request_entry = tk.Entry(req_frame,fg='white',bg='black',insertbackground='black',relief='solid',borderwidth=1  )
         self.request_entry.pack(fill=tk.X, pady=5)
         self.request_entry.insert(0, "98, 183, 37, 122, 14, 124, 65, 67")
@@ -103,12 +170,34 @@ class DiskSchedulingVisualizer:
         bottom_frame.pack(fill=tk.X, pady=5)
         
         tk.Button(bottom_frame, text="Dark Mode", command=self.toggle_theme).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        tk.Button(bottom_frame, text="Load Trace", command=self.load_trace_file).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        
+        # Phase timing: a breakdown under each result, exportable as a Chrome trace
+        profile_frame = tk.Frame(control_frame)
+        profile_frame.pack(fill=tk.X, pady=5)
+        
+        self.profile_var = tk.BooleanVar(value=profiling.enabled())
+        tk.Checkbutton(profile_frame, text="Profile", variable=self.profile_var,
+                       command=self.toggle_profiling).pack(side=tk.LEFT, padx=2)
+        tk.Button(profile_frame, text="Save Profile", command=self.save_profile).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        
+        # Background job progress
+        job_frame = tk.Frame(control_frame)
+        job_frame.pack(fill=tk.X, pady=5)
+        
+        self.progress = ttk.Progressbar(job_frame, mode="determinate")
+        self.progress.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=2)
+        self.cancel_button = tk.Button(job_frame, text="Cancel", command=self.cancel_job, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=2)
         
         # Visualization Frame
         vis_frame = tk.Frame(self.root)
         vis_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
         
-        # Matplotlib Figure
+        # Matplotlib Figure (imported here, not at module level, so worker
+        # processes that re-import this file never pay for matplotlib)
+        import matplotlib.pyplot as plt
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
         self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(10, 8), gridspec_kw={'height_ratios': [2, 1]})
         self.canvas = FigureCanvasTkAgg(self.fig, master=vis_frame)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
@@ -183,113 +272,166 @@ class DiskSchedulingVisualizer:
         num_requests = random.randint(5, 15)
         max_cyl = self.disk_size_slider.get()
         requests = sorted(random.sample(range(0, max_cyl), num_requests))
+        self.trace_requests = None
+        self.writes = self.sectors = None
         self.request_entry.delete(0, tk.END)
         self.request_entry.insert(0, ", ".join(map(str, requests)))
 
-    def parse_requests(self):
+    def load_trace_file(self):
+        path = filedialog.askopenfilename(title="Open Request Trace",
+                                          filetypes=[("Trace files", "*.csv *.txt *.bin *.i32"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.trace_requests = load_trace(path)
+            self.writes = self.sectors = None
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Trace Error", f"Could not load trace: {str(e)}")
+            return
+        
+        # The entry shows which trace is active; editing it switches back to typed requests
+        self.trace_label = f"[trace] {os.path.basename(path)} ({len(self.trace_requests)} requests)"
+        self.request_entry.delete(0, tk.END)
+        self.request_entry.insert(0, self.trace_label)
+
+    @profiling.timed("parse requests")
+    def parse_requests(self, array=False):
+        # With array=True requests are logical cylinders, bounded by the
+        # array's capacity instead of the disk size (raid.split checks them).
+        # Every run starts here, and with a fresh profile.
+        profiling.reset()
+        self.profiled_in_workers = False
         try:
             req_text = self.request_entry.get().strip()
             if not req_text:
                 raise ValueError("No requests entered")
                 
-            self.requests = [int(x.strip()) for x in req_text.split(",") if x.strip()]
-            if not self.requests:
+            if self.trace_requests is not None and req_text == self.trace_label:
+                self.requests = self.trace_requests
+                self.writes = self.sectors = None
+            else:
+                self.trace_requests = None
+                self.requests, self.writes, self.sectors = parse_request_list(req_text)
+            if len(self.requests) == 0:
                 raise ValueError("No valid requests found")
                 
-            # Validate disk size and head position
+            # Validate disk size, head position and request bounds
             self.disk_size = self.disk_size_slider.get()
             self.head_pos = self.head_pos_slider.get()
-            if self.head_pos >= self.disk_size:
-                raise ValueError("Head position must be less than disk size")
-                
-            # Validate all requests are within disk bounds
-            for req in self.requests:
-                if req >= self.disk_size or req < 0:
-                    raise ValueError(f"Request {req} exceeds disk bounds (0-{self.disk_size-1})")
+            validate([] if array else self.requests, self.head_pos, self.disk_size)
                     
             self.direction = self.direction_var.get()
             self.selected_algorithm = self.algo_combo.get()
+            tuning = [self.read_expire_var, self.write_expire_var, self.fifo_batch_var, self.arrival_rate_var]
+            if min(var.get() for var in tuning) <= 0:
+                raise ValueError("Deadline tuning values must be positive")
             return True
             
-        except ValueError as e:
+        except (ValueError, tk.TclError) as e:
             messagebox.showerror("Input Error", f"Invalid input: {str(e)}")
             return False
 
-    def run_algorithm(self, algorithm):
-        if not self.parse_requests():
-            return None, None, None, None, None, None  # total_movement, seek, rot, xfer, total, sequence
-    
-        try:
-            cmd = [r"C:\Users\JAREENA\Desktop\Loan_Data\sem4 report\OS\DiskScheduling.exe",algorithm, str(self.head_pos),
-                   str(self.disk_size), str(self.direction)] + [str(r) for r in self.requests]
-            
-            # Run with no console window
-            result = subprocess.run(cmd, capture_output=True, text=True, 
-                                  creationflags=subprocess.CREATE_NO_WINDOW)
-            output = result.stdout.strip()
-            
-            print(f"Debug - {algorithm} Output:", output)  # For troubleshooting
-            
-            if not output or "|" not in output:
-                raise ValueError("C program returned empty or invalid output")
-            
-            parts = output.split("|")
-            if len(parts) < 6:
-                raise ValueError(f"Expected 6 data parts, got {len(parts)}")
-            
-            # Convert and validate all values
-            total_movement = int(parts[0])
-            seek_time = float(parts[1])
-            rotational_latency = float(parts[2])
-            transfer_time = float(parts[3])
-            total_time = float(parts[4])
-            sequence = [int(x) for x in parts[5].split(",") if x.strip()]
-            
-            # Validate sequence matches movement
-            if len(sequence) < 2:
-                raise ValueError("Invalid movement sequence from C program")
-                
-            return total_movement, seek_time, rotational_latency, transfer_time, total_time, sequence
-            
-        except Exception as e:
-            error_msg = f"Algorithm {algorithm} failed:\n{str(e)}"
-            if 'output' in locals():
-                error_msg += f"\nRaw output: {output}"
-            messagebox.showerror("Execution Error", error_msg)
-            return None, None, None, None, None, None
+    def algorithm_options(self, algorithm):
+        # Tunables passed to schedule()/simulate(), for DEADLINE and SATF
+        if algorithm == "SATF":
+            return {"sectors": self.sectors, "model": self.disk_model}
+        if algorithm != "DEADLINE":
+            return {}
+        options = {"read_expire": self.read_expire_var.get(),
+                   "write_expire": self.write_expire_var.get(),
+                   "fifo_batch": self.fifo_batch_var.get()}
+        if self.writes is not None:
+            options["writes"] = self.writes
+        return options
+
+    def timed_options(self, algorithm):
+        # timed_schedule() arguments; the timing depends on the sectors and
+        # model for every algorithm, so they are part of its key too
+        return {**self.algorithm_options(algorithm), "sectors": self.sectors, "model": self.disk_model}
+
+    def remember_timing(self, key, timed):
+        self.timings[key] = timed
+        while len(self.timings) > self.cache.max_entries:
+            self.timings.pop(next(iter(self.timings)))
 
     def visualize(self):
-        result = self.run_algorithm(self.selected_algorithm)
-        if None in result[:5]:  # Check first five values
+        if not self.parse_requests():
             return
-            
+        self.cancel_job()
+        
+        algorithm = self.selected_algorithm
+        digest = requests_digest(self.requests)
+        params = (algorithm, self.requests, self.head_pos, self.disk_size, self.direction, digest)
+        key = result_key(*params, **self.algorithm_options(algorithm))
+        timing_key = result_key(*params, **self.timed_options(algorithm))
+        result = self.cache.get(key)
+        if result is not None and timing_key in self.timings:
+            self.draw_result(algorithm, result, self.timings[timing_key])
+            return
+        
+        def on_result(label, run, error):
+            if error is not None:
+                messagebox.showerror("Execution Error", f"Algorithm {label} failed:\n{str(error)}")
+                return
+            result, timed = run
+            self.cache.put(key, result)
+            self.remember_timing(timing_key, timed)
+            self.draw_result(label, result, timed)
+        
+        self.start_job([(algorithm, functools.partial(timed_schedule, **self.timed_options(algorithm)),
+                         (algorithm, self.requests, self.head_pos, self.disk_size, self.direction))],
+                       on_result)
+
+    def draw_result(self, algorithm, result, timed=None):
         total_movement, seek_time, rot_latency, transfer_time, total_time, sequence = result
         
+        # Add direction indicator if applicable
+        note = None
+        if algorithm in ["SCAN", "LOOK", "C-SCAN", "C-LOOK"]:
+            note = f"Direction: {'Right' if self.direction else 'Left'}"
+        self.plot_sequence(f"{algorithm} - Seek Pattern (Total Movement: {total_movement} cylinders)",
+                           sequence, np.unique(self.requests), f'Total Time: {total_time:.2f}ms', note)
+        
+        # Update results display
+        self.update_results_text(total_movement, seek_time, rot_latency, 
+                               transfer_time, total_time, sequence, timed)
+        
+        self.redraw()
+
+    @profiling.timed("build artists")
+    def plot_sequence(self, title, sequence, requested, time_label, note=None):
+        # Seek path on ax1 and service timeline on ax2, for one disk
+        from disksched.plotting import LABEL_LIMIT, LARGE_SEQUENCE, SeekPathView, TimelineView
+        
         # Clear and setup plots
         self.ax1.clear()
         self.ax2.clear()
+        self.plot_views = []
+        large = len(sequence) > LARGE_SEQUENCE
         
         # Plot 1: Movement Visualization
-        self.ax1.set_title(f"{self.selected_algorithm} - Seek Pattern (Total Movement: {total_movement} cylinders)",pad=-7)
+        self.ax1.set_title(title,pad=-7)
         self.ax1.set_xlabel("Cylinder Number",labelpad=-4)
         self.ax1.set_ylabel("Movement Step")
         self.ax1.set_xlim(-5, self.disk_size+5)
         self.ax1.set_ylim(-1, len(sequence)+1)
         
-        # Draw movement path with arrows
-        for i in range(len(sequence)-1):
-            self.ax1.annotate('', xy=(sequence[i+1], i+1), xytext=(sequence[i], i),
-                            arrowprops=dict(arrowstyle='->', color='red', lw=1.5, alpha=0.7))
+        # Draw movement path with arrows (one decimated path for long sequences)
+        if large:
+            self.plot_views.append(SeekPathView(self.ax1, sequence))
+        else:
+            for i in range(len(sequence)-1):
+                self.ax1.annotate('', xy=(sequence[i+1], i+1), xytext=(sequence[i], i),
+                                arrowprops=dict(arrowstyle='->', color='red', lw=1.5, alpha=0.7))
         
-        # Mark key points
+        # Mark key points (each requested cylinder once)
         self.ax1.scatter([sequence[0]], [0], color='green', s=100, label='Start Head', zorder=5)
-        self.ax1.scatter(self.requests, [0]*len(self.requests), color='blue', 
+        self.ax1.scatter(requested, np.zeros(len(requested)), color='blue', 
                         label='Requests', alpha=0.7, zorder=4)
         
-        # Add direction indicator if applicable
-        if self.selected_algorithm in ["SCAN", "LOOK", "C-SCAN", "C-LOOK"]:
-            dir_text = "Right" if self.direction else "Left"
-            self.ax1.text(0.02, 0.95, f"Direction: {dir_text}", 
+        if note is not None:
+            self.ax1.text(0.02, 0.95, note, 
                          transform=self.ax1.transAxes, color='purple',
                          bbox=dict(facecolor=self.bg_color, alpha=0.8))
         
@@ -301,25 +443,26 @@ class DiskSchedulingVisualizer:
         self.ax2.set_title("Request Service Timeline",pad=0)
         self.ax2.set_xlabel("Service Order")
         self.ax2.set_ylabel("Cylinder Number")
-        self.ax2.step(range(len(served_order)), served_order, where='post', 
-                     color='purple', label=f'Total Time: {total_time:.2f}ms')
-        self.ax2.scatter(range(len(served_order)), served_order, color='red', alpha=0.7)
-        
-        # Annotate points
-        for i, (x, y) in enumerate(zip(range(len(served_order)), served_order)):
-            self.ax2.annotate(f'{y}', (x, y), textcoords="offset points",
-                             xytext=(0,8), ha='center', fontsize=8)
+        if large:
+            self.ax2.set_xlim(-1, len(served_order))
+            self.ax2.set_ylim(-5, self.disk_size+5)
+            self.plot_views.append(TimelineView(self.ax2, served_order, label=time_label))
+        else:
+            self.ax2.step(range(len(served_order)), served_order, where='post', 
+                         color='purple', label=time_label)
+            self.ax2.scatter(range(len(served_order)), served_order, color='red', alpha=0.7)
+            
+            # Annotate points
+            if len(served_order) <= LABEL_LIMIT:
+                for i, (x, y) in enumerate(zip(range(len(served_order)), served_order)):
+                    self.ax2.annotate(f'{y}', (x, y), textcoords="offset points",
+                                     xytext=(0,8), ha='center', fontsize=8)
         
         self.ax2.legend()
         self.ax2.grid(True, alpha=0.3)
-        
-        # Update results display
-        self.update_results_text(total_movement, seek_time, rot_latency, 
-                               transfer_time, total_time, sequence)
-        
-        self.canvas.draw()
 
-    def update_results_text(self, movement, seek, rot, xfer, total, sequence):
+    @profiling.timed("results text")
+    def update_results_text(self, movement, seek, rot, xfer, total, sequence, timed=None):
         self.result_text.delete(1.0, tk.END)
         
         # Format the metrics display
@@ -332,9 +475,26 @@ class DiskSchedulingVisualizer:
             "─" * 30 + " TOTAL " + "─" * 13,
             f"{'TOTAL ACCESS TIME':<30}: {total:.2f} ms",
             f"{'Total Head Movement':<30}: {movement} cylinders",
+        ]
+        if timed is not None:
+            # Per-step timing: seek curve, actual sector positions (average
+            # half turn when none are given) and the media transfer rate
+            model = self.disk_model
+            source = "sector positions" if self.sectors is not None else "average half turn"
+            metrics += [
+                "─" * 22 + " ROTATIONAL MODEL " + "─" * 10,
+                f"{'Seek Time (seek curve)':<30}: {timed.seek_time:.2f} ms",
+                f"{'Rotational Latency':<30}: {timed.rotational_latency:.2f} ms ({source})",
+                f"{'Data Transfer Time':<30}: {timed.transfer_time:.2f} ms "
+                f"({self.SECTOR_SIZE / model.sector_time / 1000:.1f} MB/s)",
+                f"{'TOTAL ACCESS TIME':<30}: {timed.total_time:.2f} ms",
+            ]
+        metrics += [
             "═" * 50,
             "SERVICE ORDER:",
-            " → ".join(map(str, sequence))
+            self.format_sequence(sequence),
+            "",
+            self.cache_summary()
         ]
         
         # Insert with formatting
@@ -348,63 +508,159 @@ class DiskSchedulingVisualizer:
         self.result_text.tag_configure("highlight", foreground="blue")
         self.result_text.tag_add("highlight", "6.0", "6.end")
 
+    def format_sequence(self, sequence, edge=100):
+        # Long sequences show only both ends; Tk slows down badly on huge lines
+        if len(sequence) <= 2 * edge:
+            return " → ".join(map(str, sequence))
+        head = " → ".join(map(str, sequence[:edge]))
+        tail = " → ".join(map(str, sequence[-edge:]))
+        return f"{head} → … ({len(sequence) - 2 * edge} more) … → {tail}"
+
+    def cache_summary(self):
+        stats = self.cache.stats()
+        return f"Result cache: {stats['hits']} hits, {stats['misses']} misses"
+
     def compare_all(self):
         if not self.parse_requests():
             return
         
-        algorithms = ["FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK"]
-        results = []
+        self.cancel_job()
+        algorithms = ["FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK", "DEADLINE", "SATF"]
+        finished = {}
+        latency = {}
+        timing = {}
+        keys = {}
+        tasks = []
         
-        # Run all algorithms
+        # Reuse cached results; the rest run in the background
+        digest = requests_digest(self.requests)
         for algo in algorithms:
-            result = self.run_algorithm(algo)
-            if None not in result[:5]:  # Only use valid results
-                results.append({
-                    "algorithm": algo,
-                    "total_movement": result[0],
-                    "seek_time": result[1],
-                    "rot_latency": result[2],
-                    "transfer_time": result[3],
-                    "total_time": result[4],
-                    "sequence": result[5]
-                })
-        
-        if not results:
-            messagebox.showwarning("Comparison", "No valid results to compare")
-            return
+            params = (algo, self.requests, self.head_pos, self.disk_size, self.direction, digest)
+            keys[algo] = (result_key(*params, **self.algorithm_options(algo)),
+                          result_key(*params, **self.timed_options(algo)))
+            result = self.cache.get(keys[algo][0])
+            if result is not None and keys[algo][1] in self.timings:
+                finished[algo] = result
+                timing[algo] = self.timings[keys[algo][1]]
+            else:
+                tasks.append((algo, functools.partial(timed_schedule, **self.timed_options(algo)),
+                              (algo, self.requests, self.head_pos, self.disk_size, self.direction)))
+        
+        # Worst-case wait needs requests arriving over time, not all at t=0
+        arrivals = poisson_arrivals(len(self.requests), self.arrival_rate_var.get())
+        latency_labels = {f"{algo} latency": algo for algo in algorithms if algo in QUEUES}
+        for label, algo in latency_labels.items():
+            tasks.append((label, functools.partial(simulate_summary, **self.algorithm_options(algo)),
+                          (algo, self.requests, arrivals, self.head_pos, self.disk_size, self.direction)))
+        
+        def on_result(label, result, error):
+            if error is not None:
+                messagebox.showerror("Execution Error", f"Algorithm {label} failed:\n{str(error)}")
+                return
+            if label in latency_labels:
+                latency[latency_labels[label]] = result
+            else:
+                result, timed = result
+                self.cache.put(keys[label][0], result)
+                self.remember_timing(keys[label][1], timed)
+                finished[label] = result
+                timing[label] = timed
+            if finished:
+                self.show_comparison(algorithms, finished, running=True, latency=latency, timing=timing)
+        
+        def on_done():
+            if not finished:
+                messagebox.showwarning("Comparison", "No valid results to compare")
+                return
+            self.show_comparison(algorithms, finished, latency=latency, timing=timing)
+        
+        if finished:
+            self.show_comparison(algorithms, finished, running=True, latency=latency, timing=timing)
+        self.start_job(tasks, on_result, on_done)
+
+    def show_comparison(self, algorithms, finished, running=False, latency=None, timing=None):
+        latency = latency or {}
+        timing = timing or {}
+        results = []
+        for algo in algorithms:
+            if algo not in finished:
+                continue
+            result = finished[algo]
+            results.append({
+                "algorithm": algo,
+                "total_movement": result.total_movement,
+                "seek_time": result.seek_time,
+                "rot_latency": result.rotational_latency,
+                "transfer_time": result.transfer_time,
+                "total_time": result.total_time,
+                "access": timing.get(algo),
+                "sequence": result.sequence
+            })
+        # Rank and plot by the rotational model once every algorithm has it
+        timed = all(res['access'] is not None for res in results)
         
         # Display detailed comparison
         self.result_text.delete(1.0, tk.END)
         self.result_text.insert(tk.END, "ALGORITHM COMPARISON RESULTS\n")
         self.result_text.insert(tk.END, "═" * 50 + "\n")
         self.result_text.insert(tk.END, 
-            f"{'Algorithm':<10}{'Seek':<8}{'Rot':<8}{'Xfer':<8}{'Total':<10}{'Movement'}\n")
+            f"{'Algorithm':<10}{'Seek':<8}{'Rot':<8}{'Xfer':<8}{'Total':<10}{'Movement':<10}"
+            f"{'Access':<12}{'Max wait'}\n")
         self.result_text.insert(tk.END, "─" * 50 + "\n")
         
         for res in results:
+            summary = latency.get(res['algorithm'])
+            wait = f"{summary['max_response']:.1f} ms" if summary else "…" if res['algorithm'] in QUEUES else "-"
+            access = f"{res['access'].total_time:.2f} ms" if res['access'] is not None else "…"
             self.result_text.insert(tk.END, 
                 f"{res['algorithm']:<10}{res['seek_time']:.2f} {res['rot_latency']:.2f} "
-                f"{res['transfer_time']:.2f} {res['total_time']:.2f} {res['total_movement']}\n")
+                f"{res['transfer_time']:.2f} {res['total_time']:.2f} {res['total_movement']:<10}"
+                f"{access:<12}{wait}\n")
         
         # Highlight best algorithm
-        best = min(results, key=lambda x: x['total_time'])
+        if timed:
+            best = min(results, key=lambda x: x['access'].total_time)
+            best_time = best['access'].total_time
+        else:
+            best = min(results, key=lambda x: x['total_time'])
+            best_time = best['total_time']
         self.result_text.insert(tk.END, "═" * 50 + "\n")
         self.result_text.insert(tk.END, 
-            f"BEST: {best['algorithm']} ({best['total_time']:.2f} ms, {best['total_movement']} cylinders)\n")
+            f"BEST: {best['algorithm']} ({best_time:.2f} ms, {best['total_movement']} cylinders)\n")
+        self.result_text.insert(tk.END, self.cache_summary() + "\n")
+        self.result_text.insert(tk.END,
+            f"Max wait: simulated at {self.arrival_rate_var.get()} requests/s\n")
+        if running:
+            waiting = [algo for algo in algorithms
+                       if algo not in finished or (algo in QUEUES and algo not in latency)]
+            self.result_text.insert(tk.END, f"Running: {', '.join(waiting)}\n")
         
         # Configure text tags
         self.result_text.tag_configure("best", foreground="green", font=('TkDefaultFont', 10, 'bold'))
         self.result_text.tag_add("best", f"{len(results)+5}.0", f"{len(results)+5}.end")
         
-        # Plot comparison
+        self.plot_comparison(results, latency, timed)
+        self.redraw()
+
+    @profiling.timed("build artists")
+    def plot_comparison(self, results, latency, timed):
+        # Time components on ax1; movement against worst-case wait on ax2
         self.ax1.clear()
         self.ax2.clear()
+        self.plot_views = []
         
         # Prepare data
         x = [res['algorithm'] for res in results]
-        y_seek = [res['seek_time'] for res in results]
-        y_rot = [res['rot_latency'] for res in results]
-        y_xfer = [res['transfer_time'] for res in results]
+        if timed:
+            y_seek = [res['access'].seek_time for res in results]
+            y_rot = [res['access'].rotational_latency for res in results]
+            y_xfer = [res['access'].transfer_time for res in results]
+            y_total = [res['access'].total_time for res in results]
+        else:
+            y_seek = [res['seek_time'] for res in results]
+            y_rot = [res['rot_latency'] for res in results]
+            y_xfer = [res['transfer_time'] for res in results]
+            y_total = [res['total_time'] for res in results]
         
         # Create stacked bar chart
         p1 = self.ax1.bar(x, y_seek, label='Seek Time', color='#1f77b4')
@@ -419,17 +675,193 @@ class DiskSchedulingVisualizer:
         
         # Add value labels
         for i, res in enumerate(results):
-            self.ax1.text(i, res['total_time']+1, f"{res['total_time']:.1f}ms", ha='center', fontsize=8)
+            self.ax1.text(i, y_total[i]+1, f"{y_total[i]:.1f}ms", ha='center', fontsize=8)
             self.ax1.text(i, -3, f"{res['total_movement']} cyl", ha='center', fontsize=8)
         
-        # Second plot for movement comparison
-        self.ax2.bar(x, [res['total_movement'] for res in results], color='#9467bd')
-        self.ax2.set_title("Total Head Movement Comparison",pad=0)
-        self.ax2.set_ylabel("Cylinders")
+        # Second plot: throughput (movement) against worst-case wait once the
+        # latency simulations are in, plain movement bars until then
+        measured = [res for res in results if res['algorithm'] in latency]
+        if measured:
+            movement = [res['total_movement'] for res in measured]
+            waits = [latency[res['algorithm']]['max_response'] for res in measured]
+            self.ax2.scatter(movement, waits, color='#9467bd')
+            for res, m, w in zip(measured, movement, waits):
+                self.ax2.annotate(res['algorithm'], (m, w), textcoords="offset points",
+                                  xytext=(0, 6), ha='center', fontsize=8)
+            self.ax2.set_title("Total Movement vs Worst-Case Wait",pad=0)
+            self.ax2.set_xlabel("Cylinders")
+            self.ax2.set_ylabel("Max wait (ms)")
+        else:
+            self.ax2.bar(x, [res['total_movement'] for res in results], color='#9467bd')
+            self.ax2.set_title("Total Head Movement Comparison",pad=0)
+            self.ax2.set_ylabel("Cylinders")
+
+    def simulate_array(self):
+        if not self.parse_requests(array=True):
+            return
+        self.cancel_job()
+        
+        algorithm = self.selected_algorithm
+        try:
+            if algorithm not in QUEUES:
+                raise ValueError(f"{algorithm} has no arrival-time simulation")
+            layout = Layout(int(self.raid_level_var.get()), self.raid_disks_var.get(),
+                            self.raid_chunk_var.get(), self.disk_size)
+            shares = split(layout, self.requests, self.writes)
+        except (ValueError, tk.TclError) as e:
+            messagebox.showerror("Array Error", f"Invalid array: {str(e)}")
+            return
         
-        self.canvas.draw()
+        # One task per member disk with work to do, each in its own worker
+        arrivals = poisson_arrivals(len(self.requests), self.arrival_rate_var.get())
+        options = self.algorithm_options(algorithm)
+        options.pop("writes", None)  # simulate_share passes each disk its own
+        results = [None] * layout.disks
+        labels = {f"Disk {disk}": disk for disk, share in enumerate(shares) if share.owner.size}
+        tasks = [(label, functools.partial(simulate_share, **options),
+                  (algorithm, shares[disk], arrivals[shares[disk].owner], self.head_pos,
+                   self.disk_size, self.direction))
+                 for label, disk in labels.items()]
+        failed = []
+        
+        def on_result(label, result, error):
+            if error is not None:
+                failed.append(label)
+                messagebox.showerror("Execution Error", f"{label} failed:\n{str(error)}")
+                return
+            results[labels[label]] = result
+        
+        def on_done():
+            if failed:
+                return
+            self.array_result = (algorithm, merge(layout, arrivals, shares, results))
+            self.draw_array()
+        
+        self.start_job(tasks, on_result, on_done, use_processes=True)
+
+    def show_array_disk(self):
+        if self.array_result is not None and self.job is None:
+            self.draw_array()
+
+    def draw_array(self):
+        algorithm, array = self.array_result
+        layout = array.layout
+        try:
+            disk = min(max(self.raid_view_var.get(), 0), layout.disks - 1)
+        except tk.TclError:
+            disk = 0
+        result, share = array.disks[disk], array.shares[disk]
+        
+        # Seek pattern of the chosen member disk in the usual two plots
+        if result is None:
+            self.ax1.clear()
+            self.ax2.clear()
+            self.plot_views = []
+            self.ax1.set_title(f"RAID-{layout.level} disk {disk} - idle",pad=-7)
+        else:
+            self.plot_sequence(f"RAID-{layout.level} disk {disk} - {algorithm} Seek Pattern "
+                               f"(Total Movement: {result.total_movement} cylinders)",
+                               result.sequence, np.unique(share.requests),
+                               f'Makespan: {result.makespan:.2f}ms')
+        
+        # Array-level figures, then one line per member disk
+        summary = summarize(array)
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"RAID-{layout.level} ARRAY: {layout.disks} disks, "
+                                        f"{layout.chunk}-cylinder chunks, {algorithm}\n")
+        self.result_text.insert(tk.END, "═" * 50 + "\n")
+        self.result_text.insert(tk.END,
+            f"{'Throughput':<30}: {summary['throughput']:.1f} requests/s\n"
+            f"{'Mean / p99 / max response':<30}: {summary['mean_response']:.1f} / "
+            f"{summary['p99']:.1f} / {summary['max_response']:.1f} ms\n"
+            f"{'Total Head Movement':<30}: {summary['total_movement']} cylinders\n")
+        self.result_text.insert(tk.END, "─" * 50 + "\n")
+        self.result_text.insert(tk.END, f"{'Disk':<6}{'Accesses':<10}{'Movement':<10}{'Mean':<10}{'Max'}\n")
+        for member, (member_result, member_share) in enumerate(zip(array.disks, array.shares)):
+            if member_result is None:
+                self.result_text.insert(tk.END, f"{member:<6}{0:<10}idle\n")
+                continue
+            response = member_result.response_time
+            self.result_text.insert(tk.END,
+                f"{member:<6}{member_share.owner.size:<10}{member_result.total_movement:<10}"
+                f"{response.mean():<10.1f}{response.max():.1f} ms\n")
+        self.result_text.insert(tk.END, "═" * 50 + "\n")
+        self.result_text.insert(tk.END,
+            f"Showing disk {disk}; arrivals simulated at {self.arrival_rate_var.get()} requests/s\n")
+        
+        self.result_text.tag_configure("header", font=('TkDefaultFont', 10, 'bold'))
+        self.result_text.tag_add("header", "1.0", "1.end")
+        self.redraw()
+
+    def redraw(self):
+        # Drawn right away while profiling, so the draw shows in the breakdown
+        if not profiling.enabled():
+            self.canvas.draw_idle()
+            return
+        with profiling.phase("canvas draw"):
+            self.canvas.draw()
+        self.result_text.insert(tk.END, "\n\nPHASE TIMINGS\n" + profiling.format_breakdown())
+        if self.profiled_in_workers:
+            self.result_text.insert(tk.END, "\n(phases inside worker processes are not included)")
+
+    def toggle_profiling(self):
+        if self.profile_var.get():
+            profiling.enable()
+        else:
+            profiling.disable()
+
+    def save_profile(self):
+        if not profiling.events():
+            messagebox.showinfo("Profile", "Nothing recorded yet: tick Profile and run something first")
+            return
+        path = filedialog.asksaveasfilename(title="Save Chrome Trace", defaultextension=".json",
+                                            filetypes=[("Chrome trace", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            profiling.write_trace(path)
+        except OSError as e:
+            messagebox.showerror("Profile Error", f"Could not save trace: {str(e)}")
+
+    def start_job(self, tasks, on_result, on_done=None, use_processes=None):
+        # One job at a time: a new run replaces whatever is still going
+        self.cancel_job()
+        if use_processes is None:
+            use_processes = len(self.requests) >= PARALLEL_MIN_REQUESTS
+        self.job = Job(tasks, use_processes=use_processes)
+        self.profiled_in_workers = use_processes
+        self.job_handlers = (on_result, on_done)
+        self.progress.config(maximum=max(1, self.job.total), value=0)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.root.after(self.JOB_POLL_MS, self.poll_job, self.job)
+
+    def poll_job(self, job):
+        if job is not self.job:  # cancelled or replaced
+            return
+        on_result, on_done = self.job_handlers
+        for label, result, error in job.poll():
+            on_result(label, result, error)
+        self.progress.config(value=job.completed)
+        if job.finished:
+            self.job = None
+            self.cancel_button.config(state=tk.DISABLED)
+            if on_done is not None:
+                on_done()
+        else:
+            self.root.after(self.JOB_POLL_MS, self.poll_job, job)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+            self.job = None
+            self.progress.config(value=0)
+            self.cancel_button.config(state=tk.DISABLED)
 
     def clear(self):
+        self.cancel_job()
+        self.trace_requests = None
+        self.writes = self.sectors = None
+        self.array_result = None
         self.request_entry.delete(0, tk.END)
         self.request_entry.insert(0, "98, 183, 37, 122, 14, 124, 65, 67")
         self.head_pos_slider.set(50)
@@ -438,6 +870,7 @@ class DiskSchedulingVisualizer:
         self.algo_combo.set("FCFS")
         self.ax1.clear()
         self.ax2.clear()
+        self.plot_views = []
         self.result_text.delete(1.0, tk.END)
         self.result_text.insert(tk.END, "Ready for new simulation...")
         self.canvas.draw()
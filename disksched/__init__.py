@@ -0,0 +1,45 @@
+"""Disk scheduling engine shared by the visualizer and scripts."""
+
+from .algorithms import (
+    ALGORITHMS,
+    ScheduleResult,
+    clook,
+    compute_times,
+    cscan,
+    deadline,
+    fcfs,
+    look,
+    satf,
+    scan,
+    schedule,
+    seek_distance,
+    sstf,
+    validate,
+)
+from .cache import ResultCache
+from .online import online_scheduler
+from .simulate import SimulationResult, simulate
+from .trace import load_trace, save_trace
+
+__all__ = [
+    "ALGORITHMS",
+    "ResultCache",
+    "ScheduleResult",
+    "SimulationResult",
+    "clook",
+    "compute_times",
+    "cscan",
+    "deadline",
+    "fcfs",
+    "load_trace",
+    "look",
+    "online_scheduler",
+    "satf",
+    "scan",
+    "save_trace",
+    "schedule",
+    "seek_distance",
+    "simulate",
+    "sstf",
+    "validate",
+]
@@ -0,0 +1,245 @@
+"""NumPy port of the schedulers in DiskScheduling.c.
+
+Every function takes the requests in arrival order, the initial head
+position, the disk size and the initial direction (1 = right, 0 = left)
+and returns the service sequence as an int32 array whose first element is
+the starting head position.  The output matches the C program exactly,
+including the way its return sweeps revisit cylinders.
+"""
+
+from typing import NamedTuple
+
+import numpy as np
+
+from . import profiling
+
+# Disk parameters (same values as the #defines in DiskScheduling.c)
+RPM = 7200            # Disk rotation speed (revolutions per minute)
+SECTOR_SIZE = 512     # Bytes per sector
+TRACK_SIZE = 1000     # Sectors per track
+SEEK_RATE = 0.1       # ms per cylinder seek
+TRANSFER_RATE = 125   # sectors per ms
+
+# DEADLINE tunables, defaulting to Linux mq-deadline's
+READ_EXPIRE = 500.0     # ms a read may wait before it jumps the elevator
+WRITE_EXPIRE = 5000.0   # ms, same for writes
+FIFO_BATCH = 16         # requests served in elevator order between expiry checks
+WRITES_STARVED = 2      # read batches allowed to pass pending writes
+
+SEQUENCE_DTYPE = np.int32
+
+
+class ScheduleResult(NamedTuple):
+    total_movement: int
+    seek_time: float
+    rotational_latency: float
+    transfer_time: float
+    total_time: float
+    sequence: np.ndarray
+
+
+def _as_requests(requests):
+    arr = np.asarray(requests, dtype=SEQUENCE_DTYPE)
+    if arr.ndim != 1 or arr.size == 0:
+        raise ValueError("requests must be a non-empty 1-D sequence of cylinders")
+    return arr
+
+
+def _join(*parts):
+    return np.concatenate([np.asarray(p, dtype=SEQUENCE_DTYPE).ravel() for p in parts])
+
+
+def _distinct(values):
+    # Strictly monotonic sweep: repeated cylinders collapse to one stop
+    if values.size == 0:
+        return values
+    keep = np.empty(values.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(values[1:], values[:-1], out=keep[1:])
+    return values[keep]
+
+
+def fcfs(requests, head, disk_size=200, direction=1):
+    return _join([head], _as_requests(requests))
+
+
+def sstf(requests, head, disk_size=200, direction=1):
+    reqs = _as_requests(requests)
+    # Group duplicate cylinders; once the head reaches a cylinder every copy
+    # is served at distance 0.  Ties between the left and right neighbour go
+    # to whichever was submitted first, as in the C scan over requests[].
+    values, first, counts = np.unique(reqs, return_index=True, return_counts=True)
+    values = values.tolist()
+    first = first.tolist()
+    order = []
+
+    right = int(np.searchsorted(np.asarray(values), head, side="left"))
+    left = right - 1
+    pos = head
+    while left >= 0 or right < len(values):
+        if left < 0:
+            pick = right
+        elif right >= len(values):
+            pick = left
+        else:
+            dl = pos - values[left]
+            dr = values[right] - pos
+            if dl < dr or (dl == dr and first[left] < first[right]):
+                pick = left
+            else:
+                pick = right
+        order.append(pick)
+        pos = values[pick]
+        if pick == left:
+            left -= 1
+        else:
+            right += 1
+
+    order = np.asarray(order, dtype=np.intp)
+    served = np.repeat(np.asarray(values, dtype=SEQUENCE_DTYPE)[order], counts[order])
+    return _join([head], served)
+
+
+def scan(requests, head, disk_size=200, direction=1):
+    s = np.sort(_as_requests(requests))
+    if direction == 1:
+        first = s[s >= head]
+        back = _distinct(s[s < disk_size - 1])[::-1]
+        return _join([head], first, [disk_size - 1], back)
+    first = s[s <= head][::-1]
+    back = _distinct(s[s > 0])
+    return _join([head], first, [0], back)
+
+
+def look(requests, head, disk_size=200, direction=1):
+    s = np.sort(_as_requests(requests))
+    if direction == 1:
+        first = s[s >= head]
+        turn = first[-1] if first.size else head
+        back = _distinct(s[s < turn])[::-1]
+    else:
+        first = s[s <= head][::-1]
+        turn = first[-1] if first.size else head
+        back = _distinct(s[s > turn])
+    return _join([head], first, back)
+
+
+def cscan(requests, head, disk_size=200, direction=1):
+    s = np.sort(_as_requests(requests))
+    if direction == 1:
+        first = s[s >= head]
+        last = first[-1] if first.size else head
+        edge = [disk_size - 1] if last != disk_size - 1 else []
+        return _join([head], first, edge, [0], s[s < head])
+    first = s[s <= head][::-1]
+    last = first[-1] if first.size else head
+    edge = [0] if last != 0 else []
+    return _join([head], first, edge, [disk_size - 1], s[s > head][::-1])
+
+
+def clook(requests, head, disk_size=200, direction=1):
+    s = np.sort(_as_requests(requests))
+    if direction == 1:
+        first = s[s >= head]
+        turn = first[-1] if first.size else head
+        if s[0] >= turn:
+            return _join([head], first)
+        return _join([head], first, [s[0]], _distinct(s[s > s[0]]))
+    first = s[s <= head][::-1]
+    turn = first[-1] if first.size else head
+    if s[-1] <= turn:
+        return _join([head], first)
+    return _join([head], first, [s[-1]], _distinct(s[s < s[-1]])[::-1])
+
+
+def deadline(requests, head, disk_size=200, direction=1, **options):
+    """mq-deadline style scheduling with every request queued at t=0.
+
+    Expiry is measured on the simulated clock (see disksched.simulate), so
+    long queues start jumping to expired requests once the head has been
+    busy for ``read_expire`` ms.  The elevator always sweeps upward, as
+    mq-deadline does; ``direction`` is accepted for symmetry only.
+    """
+    from .simulate import simulate
+    reqs = _as_requests(requests)
+    result = simulate("DEADLINE", reqs, np.zeros(reqs.size), head, disk_size, direction, **options)
+    return _join([head], reqs[np.argsort(result.finish, kind="stable")])
+
+
+def satf(requests, head, disk_size=200, direction=1, sectors=None, model=None):
+    """Shortest access time first over (cylinder, sector) requests.
+
+    See disksched.rotational for the timing ``model``.  Without ``sectors``
+    every request is taken to start at sector 0.  ``direction`` is accepted
+    for symmetry only.
+    """
+    from .rotational import DEFAULT_MODEL, satf_order
+    reqs = _as_requests(requests)
+    if sectors is None:
+        sectors = np.zeros(reqs.size, dtype=np.int64)
+    order = satf_order(reqs, sectors, head, disk_size, model or DEFAULT_MODEL)
+    return _join([head], reqs[order])
+
+
+ALGORITHMS = {
+    "FCFS": fcfs,
+    "SSTF": sstf,
+    "SCAN": scan,
+    "LOOK": look,
+    "C-SCAN": cscan,
+    "C-LOOK": clook,
+    "DEADLINE": deadline,
+    "SATF": satf,
+}
+
+# Keyword tunables accepted by schedule()/simulate() per algorithm
+OPTIONS = {
+    "DEADLINE": ("writes", "read_expire", "write_expire", "fifo_batch", "writes_starved"),
+    "SATF": ("sectors", "model"),
+}
+
+
+def check_options(algorithm, options):
+    unknown = sorted(set(options) - set(OPTIONS.get(algorithm, ())))
+    if unknown:
+        raise ValueError(f"{algorithm} does not accept: {', '.join(unknown)}")
+
+
+def validate(requests, head, disk_size):
+    """Raise ValueError unless head and every request lie on the disk."""
+    if disk_size <= 0:
+        raise ValueError("Disk size must be positive")
+    if head < 0:
+        raise ValueError("Head position must not be negative")
+    if head >= disk_size:
+        raise ValueError("Head position must be less than disk size")
+    reqs = np.asarray(requests)
+    out_of_bounds = reqs[(reqs >= disk_size) | (reqs < 0)]
+    if out_of_bounds.size:
+        raise ValueError(f"Request {out_of_bounds[0]} exceeds disk bounds (0-{disk_size-1})")
+
+
+def seek_distance(sequence):
+    seq = np.asarray(sequence, dtype=np.int64)
+    return int(np.abs(np.diff(seq)).sum())
+
+
+def compute_times(total_movement, n_requests):
+    seek_time = total_movement * SEEK_RATE
+    rotational_latency = (60.0 * 1000) / (RPM * 2)  # Average rotational latency in ms
+    transfer_time = n_requests * SECTOR_SIZE / (TRANSFER_RATE * 1000.0)
+    total_time = seek_time + rotational_latency + transfer_time
+    return seek_time, rotational_latency, transfer_time, total_time
+
+
+def schedule(algorithm, requests, head, disk_size=200, direction=1, **options):
+    try:
+        func = ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}") from None
+    check_options(algorithm, options)
+    reqs = _as_requests(requests)
+    with profiling.phase("schedule", algorithm=algorithm, requests=int(reqs.size)):
+        sequence = func(reqs, int(head), int(disk_size), int(direction), **options)
+    total_movement = seek_distance(sequence)
+    return ScheduleResult(total_movement, *compute_times(total_movement, reqs.size), sequence)
@@ -0,0 +1,225 @@
+"""Reproducible benchmarks for the schedulers and the GUI rendering path.
+
+    python -m disksched bench --sizes 10 1000 100000 --save-baseline base.json
+    python -m disksched bench --sizes 10 1000 100000 --baseline base.json
+
+Workloads are generated from a fixed seed (or replayed from a trace), so
+two runs measure the same work.  Every algorithm is timed on the NumPy
+engine ("python") and, when the compiled program is available, through a
+full subprocess round trip ("native") and an in-process ctypes call into
+the shared library ("clib").  ``--render`` also times drawing a
+seek pattern the way visualize() does.  Results are reported as requests
+per second, plus peak traced memory for the NumPy path, and can be saved
+as a baseline; comparing
+against a baseline flags entries that got slower than the tolerance and
+exits with status 1.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .algorithms import ALGORITHMS, schedule
+from .native import NATIVE_ALGORITHMS
+
+WORKLOADS = ["uniform", "clustered", "sequential"]
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+
+
+def make_workload(kind, n, disk_size, seed=0, trace=None):
+    rng = np.random.default_rng(seed)
+    if kind == "uniform":
+        requests = rng.integers(0, disk_size, n)
+    elif kind == "clustered":
+        # A handful of hot regions, as with a few busy files
+        centers = rng.integers(0, disk_size, 8)
+        spread = max(1, disk_size // 100)
+        requests = rng.normal(centers[rng.integers(0, len(centers), n)], spread)
+    elif kind == "sequential":
+        # Streaming reads: runs of consecutive cylinders from random starts
+        run = 64
+        starts = rng.integers(0, disk_size, -(-n // run))
+        requests = (starts[:, None] + np.arange(run)).ravel()[:n]
+    elif kind == "trace":
+        from .trace import load_trace
+        replay = np.asarray(load_trace(trace))
+        requests = np.resize(replay, n)
+    else:
+        raise ValueError(f"Unknown workload: {kind}")
+    return np.clip(requests, 0, disk_size - 1).astype(np.int32)
+
+
+def _time(func, min_time=0.2, repeat=5):
+    """Best per-call time, looping fast calls until each sample takes min_time."""
+    func()  # warm up: lazy imports, page faults, caches
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 10
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def _python_peak(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _render(sequence, disk_size):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from .plotting import SeekPathView, TimelineView
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8), gridspec_kw={"height_ratios": [2, 1]})
+    ax1.set_xlim(-5, disk_size + 5)
+    ax1.set_ylim(-1, len(sequence) + 1)
+    ax2.set_xlim(-1, len(sequence) - 1)
+    ax2.set_ylim(-5, disk_size + 5)
+    views = [SeekPathView(ax1, sequence), TimelineView(ax2, sequence[1:])]
+    fig.canvas.draw()
+    plt.close(fig)
+    return views
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, workloads=WORKLOADS, algorithms=tuple(ALGORITHMS),
+                   paths=("python", "native", "clib"), disk_size=100_000, seed=0, trace=None,
+                   render=False, min_time=0.2, log=None):
+    """Run the grid and return a list of result dicts."""
+    native = None
+    if "native" in paths:
+        from .native import default_executable, run_native
+        if os.path.exists(default_executable()):
+            native = run_native
+        elif log is not None:
+            log(f"skipping native path: {default_executable()} not found")
+    clib = None
+    if "clib" in paths:
+        from . import clib as clib_module
+        if clib_module.available():
+            clib = clib_module.schedule_c
+        elif log is not None:
+            log(f"skipping clib path: {clib_module.default_library()} not found")
+
+    results = []
+
+    def record(path, workload, algorithm, n, seconds, peak):
+        entry = {"path": path, "workload": workload, "algorithm": algorithm, "n": n,
+                 "seconds": seconds, "requests_per_sec": n / seconds if seconds else None,
+                 "peak_bytes": peak}
+        results.append(entry)
+        if log is not None:
+            log(format_result(entry))
+
+    for workload in workloads:
+        for n in sizes:
+            requests = make_workload(workload, n, disk_size, seed, trace)
+            head = disk_size // 2
+            for algo in algorithms:
+                if "python" in paths:
+                    call = lambda: schedule(algo, requests, head, disk_size, 1)
+                    record("python", workload, algo, n, _time(call, min_time), _python_peak(call))
+                if native is not None and algo in NATIVE_ALGORITHMS:
+                    call = lambda: native(algo, requests, head, disk_size, 1)
+                    # Child memory is not measurable portably (ru_maxrss of a
+                    # child includes the forked interpreter), so none is reported
+                    record("native", workload, algo, n, _time(call, min_time), None)
+                if clib is not None and algo in NATIVE_ALGORITHMS:
+                    call = lambda: clib(algo, requests, head, disk_size, 1)
+                    record("clib", workload, algo, n, _time(call, min_time), None)
+            if render:
+                sequence = schedule("FCFS", requests, head, disk_size, 1).sequence
+                record("render", workload, "FCFS", n,
+                       _time(lambda: _render(sequence, disk_size), min_time, repeat=2), None)
+    return results
+
+
+def result_key(entry):
+    return f"{entry['path']}/{entry['workload']}/{entry['algorithm']}/{entry['n']}"
+
+
+def format_result(entry):
+    peak = entry["peak_bytes"]
+    peak = f"{peak / 2**20:9.1f}" if peak is not None else f"{'-':>9}"
+    rate = entry["requests_per_sec"] or 0
+    return (f"{entry['path']:<7}{entry['workload']:<11}{entry['algorithm']:<8}{entry['n']:>10} "
+            f"{entry['seconds'] * 1000:12.3f} {rate:14,.0f} {peak}")
+
+
+def compare_to_baseline(results, baseline, tolerance=0.2):
+    """Entries whose throughput dropped more than ``tolerance`` below the baseline."""
+    previous = {result_key(entry): entry for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = previous.get(result_key(entry))
+        if old is None or not old["requests_per_sec"] or not entry["requests_per_sec"]:
+            continue
+        ratio = entry["requests_per_sec"] / old["requests_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append((entry, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m disksched bench",
+                                     description="Benchmark disk scheduling throughput")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--workloads", nargs="+", choices=WORKLOADS + ["trace"], default=WORKLOADS)
+    parser.add_argument("--trace", help="trace file replayed by the 'trace' workload")
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--paths", nargs="+", choices=["python", "native", "clib"], default=["python", "native", "clib"])
+    parser.add_argument("--disk-size", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--render", action="store_true", help="also time drawing the seek pattern")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing sample")
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed throughput drop before flagging (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+    if "trace" in args.workloads and not args.trace:
+        parser.error("the trace workload needs --trace")
+
+    print(f"{'path':<7}{'workload':<11}{'algo':<8}{'n':>10} {'ms/run':>12} {'requests/s':>14} {'peak MiB':>9}")
+    results = run_benchmarks(args.sizes, args.workloads, args.algorithms, args.paths,
+                             args.disk_size, args.seed, args.trace, args.render,
+                             args.min_time, log=print)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+        for entry, ratio in regressions:
+            print(f"REGRESSION {result_key(entry)}: {ratio:.0%} of baseline throughput")
+        if regressions:
+            return 1
+        print("no regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Memoization of scheduling runs.
+
+Results are keyed by a hash of (algorithm, head, disk_size, direction,
+requests) plus any algorithm tunables.  A ResultCache keeps recent
+results in an in-memory LRU and can also persist them to a directory,
+one file per key in the DiskScheduling ``--binary`` result layout,
+evicting least recently used files once the directory grows past
+``max_disk_bytes``.
+"""
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from . import profiling
+from .algorithms import schedule
+from .native import pack_result, parse_result
+
+CACHE_SUFFIX = ".dsr"
+
+
+def requests_digest(requests):
+    requests = np.ascontiguousarray(requests, dtype="<i4")
+    return hashlib.blake2b(memoryview(requests).cast("B"), digest_size=16).digest()
+
+
+def result_key(algorithm, requests, head, disk_size, direction, digest=None, **options):
+    """Cache key; pass ``digest`` from requests_digest to avoid rehashing the
+    same request array for every algorithm."""
+    if digest is None:
+        digest = requests_digest(requests)
+    params = f"{algorithm}|{int(head)}|{int(disk_size)}|{int(direction)}|"
+    for name, value in sorted(options.items()):
+        if isinstance(value, (list, np.ndarray)):  # per-request values such as writes
+            value = requests_digest(value).hex()
+        params += f"{name}={value}|"
+    params = params.encode()
+    return hashlib.blake2b(params + digest, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, max_entries=64, directory=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_bytes = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def __len__(self):
+        return len(self.memory)
+
+    def stats(self):
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "entries": len(self.memory), "disk_bytes": self.disk_bytes}
+
+    def clear(self):
+        self.memory.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def _disk_entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_SUFFIX):
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:  # evicted by another process
+                    continue
+                entries.append((entry.path, st.st_size, st.st_mtime))
+        return entries
+
+    def _remember(self, key, result):
+        result.sequence.setflags(write=False)  # shared between callers
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key):
+        result = self.memory.get(key)
+        if result is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return result
+
+        if self.directory is not None:
+            path = self._path(key)
+            try:
+                with profiling.phase("cache read"), open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)  # mtime doubles as last-access time for eviction
+            except FileNotFoundError:
+                pass
+            else:
+                result = parse_result(data)
+                self._remember(key, result)
+                self.hits += 1
+                self.disk_hits += 1
+                return result
+
+        self.misses += 1
+        return None
+
+    def put(self, key, result):
+        self._remember(key, result)
+        if self.directory is None:
+            return
+
+        data = pack_result(result)
+        # Write then rename so concurrent sweep workers never see partial files
+        with profiling.phase("cache write"):
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        self.disk_bytes += len(data)
+        if self.disk_bytes > self.max_disk_bytes:
+            self._evict()
+
+    def _evict(self):
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[2])
+        self.disk_bytes = sum(size for _, size, _ in entries)
+        # Trim to 90% of the limit so eviction does not run on every put
+        target = self.max_disk_bytes * 0.9
+        for path, size, _ in entries:
+            if self.disk_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.disk_bytes -= size
+
+    def schedule(self, algorithm, requests, head, disk_size=200, direction=1, digest=None,
+                 **options):
+        key = result_key(algorithm, requests, head, disk_size, direction, digest, **options)
+        result = self.get(key)
+        if result is None:
+            result = schedule(algorithm, requests, head, disk_size, direction, **options)
+            self.put(key, result)
+        return result
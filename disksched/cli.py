@@ -0,0 +1,264 @@
+"""Command line interface: ``python -m disksched``.
+
+    python -m disksched run SSTF --requests 98,183,37,122 --head 53
+    python -m disksched compare --trace workload.bin --disk-size 5000 --format csv
+    python -m disksched simulate --trace workload.bin --rate 150 --algorithms SSTF LOOK
+    python -m disksched raid --level 5 --disks 4 --trace workload.bin --rate 400
+    python -m disksched sweep workload.bin --heads 0 100 --out sweep.csv
+    python -m disksched bench --sizes 1000 100000 --baseline base.json
+    python -m disksched --profile run.json compare --trace workload.bin
+
+Only NumPy is imported at startup; nothing here touches tkinter or
+matplotlib, so the CLI runs on display-less machines and starts in a
+fraction of the time the GUI needs for its imports alone.
+"""
+
+import argparse
+import csv
+import json
+import sys
+
+from .algorithms import ALGORITHMS, OPTIONS, schedule, validate
+from .simulate import CLIB_QUEUES, QUEUES
+
+METRICS = ["total_movement", "seek_time", "rotational_latency", "transfer_time", "total_time"]
+# Totals of the rotational-position timing model, reported with --rotational
+ACCESS_METRICS = {"access_seek_time": "seek_time", "access_rotational_latency": "rotational_latency",
+                  "access_transfer_time": "transfer_time", "access_time": "total_time"}
+
+
+def _parse_direction(value):
+    choices = {"1": 1, "right": 1, "0": 0, "left": 0}
+    try:
+        return choices[value.lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError("direction must be right/1 or left/0") from None
+
+
+def _add_workload_args(parser, batch=True):
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--requests",
+                        help="comma separated cylinder[:sector] numbers, 'w' suffix for writes")
+    source.add_argument("--trace", help="trace file (.csv/.txt or .bin/.i32)")
+    parser.add_argument("--head", type=int, default=50, help="initial head position (default 50)")
+    parser.add_argument("--disk-size", type=int, default=200, help="number of cylinders (default 200)")
+    parser.add_argument("--direction", type=_parse_direction, default=1,
+                        help="initial direction: right/1 or left/0 (default right)")
+    parser.add_argument("--format", choices=["json", "csv"], default="json")
+    if batch:
+        parser.add_argument("--native", action="store_true",
+                            help="run the compiled DiskScheduling program instead of the NumPy engine")
+        parser.add_argument("--rotational", action="store_true",
+                            help="also time each step with seek curve and rotational position")
+    tuning = parser.add_argument_group("DEADLINE tuning")
+    tuning.add_argument("--read-expire", type=float, help="ms before a read expires (default 500)")
+    tuning.add_argument("--write-expire", type=float, help="ms before a write expires (default 5000)")
+    tuning.add_argument("--fifo-batch", type=int, help="requests per elevator batch (default 16)")
+    tuning.add_argument("--writes-starved", type=int,
+                        help="read batches that may pass pending writes (default 2)")
+
+
+def _load_requests(args):
+    args.writes = args.sectors = None
+    if args.trace is not None:
+        from .trace import load_trace
+        return load_trace(args.trace)
+    from .trace import parse_request_list
+    requests, args.writes, args.sectors = parse_request_list(args.requests)
+    return requests
+
+
+def _options(algorithm, args):
+    # Tunables given on the command line, for the algorithms that take them
+    accepted = OPTIONS.get(algorithm, ())
+    values = {"writes": args.writes, "sectors": args.sectors, "read_expire": args.read_expire,
+              "write_expire": args.write_expire, "fifo_batch": args.fifo_batch,
+              "writes_starved": args.writes_starved}
+    return {name: value for name, value in values.items() if name in accepted and value is not None}
+
+
+def _run(algorithm, requests, args):
+    if args.native:
+        from .native import run_native
+        result = run_native(algorithm, requests, args.head, args.disk_size, args.direction,
+                            trace=args.trace)
+    elif args.rotational:
+        # SATF's per-step order is needed to time it, so it comes from here
+        from .rotational import timed_schedule
+        options = _options(algorithm, args)
+        options.pop("sectors", None)
+        return timed_schedule(algorithm, requests, args.head, args.disk_size, args.direction,
+                              sectors=args.sectors, **options)
+    else:
+        result = schedule(algorithm, requests, args.head, args.disk_size, args.direction,
+                          **_options(algorithm, args))
+    if args.rotational:
+        from .rotational import access_times
+        return result, access_times(result.sequence, requests, args.sectors, disk_size=args.disk_size)
+    return result, None
+
+
+def _row(algorithm, run):
+    result, timed = run
+    row = {"algorithm": algorithm}
+    row.update({name: getattr(result, name) for name in METRICS})
+    if timed is not None:
+        row.update({name: getattr(timed, field) for name, field in ACCESS_METRICS.items()})
+    return row
+
+
+def _write(rows, fmt, out):
+    if fmt == "json":
+        # Pretty-print for people, compact when piped (sequences can be huge)
+        json.dump(rows if len(rows) != 1 else rows[0], out, indent=2 if out.isatty() else None)
+        out.write("\n")
+    else:
+        fields = [field for field in rows[0] if field != "sequence"]
+        writer = csv.DictWriter(out, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def cmd_run(args):
+    requests = _load_requests(args)
+    validate(requests, args.head, args.disk_size)
+    run = _run(args.algorithm, requests, args)
+    row = _row(args.algorithm, run)
+    if not args.no_sequence:
+        row["sequence"] = run[0].sequence.tolist()
+    _write([row], args.format, sys.stdout)
+
+
+def cmd_compare(args):
+    requests = _load_requests(args)
+    validate(requests, args.head, args.disk_size)
+    algorithms = args.algorithms
+    if algorithms is None:
+        from .native import NATIVE_ALGORITHMS
+        algorithms = NATIVE_ALGORITHMS if args.native else ALGORITHMS
+    rows = [_row(algo, _run(algo, requests, args)) for algo in algorithms]
+    best = min(rows, key=lambda row: row["access_time" if args.rotational else "total_time"])
+    for row in rows:
+        row["best"] = row is best
+    _write(rows, args.format, sys.stdout)
+
+
+def _add_arrival_args(parser):
+    arrivals = parser.add_mutually_exclusive_group(required=True)
+    arrivals.add_argument("--rate", type=float, help="Poisson arrivals, requests per second")
+    arrivals.add_argument("--arrivals", help="comma separated arrival times in ms, one per request")
+    parser.add_argument("--seed", type=int, default=0, help="seed for --rate (default 0)")
+
+
+def _load_arrivals(args, n):
+    from .simulate import poisson_arrivals
+    if args.arrivals is not None:
+        return [float(x) for x in args.arrivals.split(",") if x.strip()]
+    return poisson_arrivals(n, args.rate, args.seed)
+
+
+def cmd_simulate(args):
+    from .simulate import simulate, summarize
+    requests = _load_requests(args)
+    validate(requests, args.head, args.disk_size)
+    arrivals = _load_arrivals(args, len(requests))
+    algorithms = args.algorithms
+    if algorithms is None:
+        algorithms = CLIB_QUEUES if args.clib else QUEUES
+    rows = []
+    for algo in algorithms:
+        result = simulate(algo, requests, arrivals, args.head, args.disk_size, args.direction,
+                          clib=args.clib, **_options(algo, args))
+        row = {"algorithm": algo}
+        row.update(summarize(result))
+        rows.append(row)
+    _write(rows, args.format, sys.stdout)
+
+
+def cmd_raid(args):
+    from .raid import Layout, simulate_array
+    from .simulate import summarize
+    requests = _load_requests(args)
+    arrivals = _load_arrivals(args, len(requests))
+    layout = Layout(args.level, args.disks, args.chunk, args.disk_size)
+    options = _options(args.algorithm, args)
+    options.pop("writes", None)   # split per disk by simulate_array
+    array = simulate_array(layout, args.algorithm, requests, arrivals, args.head, args.direction,
+                           writes=args.writes, processes=args.processes, **options)
+    # One row per member disk that had work, then the array as a whole
+    rows = [dict(disk=disk, algorithm=args.algorithm, **summarize(result))
+            for disk, result in enumerate(array.disks) if result is not None]
+    rows.append(dict(disk="array", algorithm=args.algorithm, **summarize(array)))
+    _write(rows, args.format, sys.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m disksched",
+                                     description="Disk scheduling algorithms without the GUI")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="time each phase; write a Chrome trace to PATH, a summary to stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run one algorithm")
+    run.add_argument("algorithm", choices=list(ALGORITHMS))
+    _add_workload_args(run)
+    run.add_argument("--no-sequence", action="store_true", help="omit the service sequence")
+    run.set_defaults(func=cmd_run)
+
+    compare = commands.add_parser("compare", help="run several algorithms and pick the best")
+    compare.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS),
+                         help="default: all of them (with --native, all the C program has)")
+    _add_workload_args(compare)
+    compare.set_defaults(func=cmd_compare)
+
+    simulate = commands.add_parser("simulate", help="serve requests arriving over time, report latency")
+    simulate.add_argument("--algorithms", nargs="+", choices=list(QUEUES),
+                          help="default: all of them (with --clib, all the library runs)")
+    simulate.add_argument("--clib", action="store_true",
+                          help="run the event loop in the DiskScheduling shared library")
+    _add_workload_args(simulate, batch=False)
+    _add_arrival_args(simulate)
+    simulate.set_defaults(func=cmd_simulate)
+
+    raid = commands.add_parser("raid", help="simulate an array of disks serving a logical trace")
+    raid.add_argument("--algorithm", choices=list(QUEUES), default="LOOK")
+    # raid.LEVELS, spelled out so startup does not import the process pool machinery
+    raid.add_argument("--level", type=int, choices=(0, 1, 5), default=0, help="RAID level (default 0)")
+    raid.add_argument("--disks", type=int, default=4, help="member disks (default 4)")
+    raid.add_argument("--chunk", type=int, default=16, help="cylinders per chunk (default 16)")
+    raid.add_argument("--processes", type=int, help="worker processes (default one per disk)")
+    _add_workload_args(raid, batch=False)
+    _add_arrival_args(raid)
+    raid.set_defaults(func=cmd_raid)
+
+    commands.add_parser("sweep", add_help=False, help="parameter sweep (see 'sweep --help')")
+    commands.add_parser("bench", add_help=False, help="benchmarks (see 'bench --help')")
+
+    args, rest = parser.parse_known_args(argv)
+    if args.profile:
+        from . import profiling
+        profiling.enable()
+    try:
+        return _dispatch(parser, args, rest)
+    finally:
+        if args.profile:
+            profiling.write_trace(args.profile)
+            print(profiling.format_breakdown(), file=sys.stderr)
+
+
+def _dispatch(parser, args, rest):
+    if args.command == "sweep":
+        from .sweep import main as sweep_main
+        return sweep_main(rest)
+    if args.command == "bench":
+        from .benchmark import main as bench_main
+        return bench_main(rest)
+    if rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+
+    try:
+        args.func(args)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
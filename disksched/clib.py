@@ -0,0 +1,134 @@
+"""ctypes binding to the reentrant DiskScheduling shared library.
+
+Build the library next to this package (see the top of DiskScheduling.c):
+
+    gcc -O2 -shared -fPIC -DDISKSCHED_LIBRARY -o libdiskscheduling.so DiskScheduling.c
+
+The library keeps no global state, and ctypes releases the GIL for the
+duration of each call, so several threads can schedule different
+workloads at once inside one process.  Request and sequence arrays are
+passed as pointers into NumPy buffers: int32 C-contiguous input (including
+a binary trace memmap) is used without a copy, and the sequence is written
+straight into a NumPy array.
+"""
+
+import ctypes
+import os
+import sys
+
+import numpy as np
+
+from . import profiling
+from .algorithms import ScheduleResult, compute_times
+
+DS_OK = 0
+DS_UNKNOWN_ALGORITHM = -1
+DS_OUT_OF_MEMORY = -2
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_lib = None
+
+
+def default_library():
+    path = os.environ.get("DISKSCHED_LIB")
+    if path:
+        return path
+    if sys.platform == "win32":
+        name = "DiskScheduling.dll"
+    elif sys.platform == "darwin":
+        name = "libdiskscheduling.dylib"
+    else:
+        name = "libdiskscheduling.so"
+    return os.path.join(_ROOT, name)
+
+
+def load_library(path=None):
+    """Load (once) and return the shared library; raises OSError if missing."""
+    global _lib
+    if _lib is not None and path is None:
+        return _lib
+    lib = ctypes.CDLL(path or default_library())
+    int32_array = np.ctypeslib.ndpointer(dtype=np.int32, ndim=1, flags="C_CONTIGUOUS")
+    lib.max_sequence_length.argtypes = [ctypes.c_int]
+    lib.max_sequence_length.restype = ctypes.c_int
+    lib.run_algorithm.argtypes = [
+        ctypes.c_char_p, int32_array, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        int32_array, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_longlong),
+    ]
+    lib.run_algorithm.restype = ctypes.c_int
+    float64_array = np.ctypeslib.ndpointer(dtype=np.float64, ndim=1, flags="C_CONTIGUOUS")
+    lib.simulate_queue.argtypes = [
+        ctypes.c_char_p, int32_array, float64_array, ctypes.c_int, ctypes.c_int, ctypes.c_int,
+        ctypes.c_int, ctypes.c_double, ctypes.c_double, float64_array, float64_array, int32_array,
+        ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_longlong),
+    ]
+    lib.simulate_queue.restype = ctypes.c_int
+    if path is None:
+        _lib = lib
+    return lib
+
+
+def available():
+    try:
+        load_library()
+    except OSError:
+        return False
+    return True
+
+
+def schedule_c(algorithm, requests, head, disk_size=200, direction=1, out=None):
+    """Same contract as disksched.schedule, computed by the C library.
+
+    ``out`` may be a reusable int32 buffer of at least
+    ``2 * len(requests) + 3`` entries; the returned sequence is a view of it.
+    """
+    lib = load_library()
+    requests = np.ascontiguousarray(requests, dtype=np.int32)
+    if requests.ndim != 1 or requests.size == 0:
+        raise ValueError("requests must be a non-empty 1-D sequence of cylinders")
+    n = requests.size
+    capacity = lib.max_sequence_length(n)
+    if out is None:
+        out = np.empty(capacity, dtype=np.int32)
+    elif out.dtype != np.int32 or not out.flags.c_contiguous or out.size < capacity:
+        raise ValueError(f"out must be a contiguous int32 array of at least {capacity} entries")
+
+    seq_length = ctypes.c_int()
+    total_movement = ctypes.c_longlong()
+    with profiling.phase("C library", algorithm=algorithm, requests=n):
+        status = lib.run_algorithm(algorithm.encode(), requests, n, int(head), int(disk_size),
+                                   int(direction), out, ctypes.byref(seq_length),
+                                   ctypes.byref(total_movement))
+    if status == DS_UNKNOWN_ALGORITHM:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if status == DS_OUT_OF_MEMORY:
+        raise MemoryError("DiskScheduling library ran out of memory")
+
+    movement = total_movement.value
+    return ScheduleResult(movement, *compute_times(movement, n), out[:seq_length.value])
+
+
+def simulate_queue(algorithm, cylinders, arrivals, head, disk_size, direction, seek_rate, per_request):
+    """The event loop of simulate.simulate, run by the C library (SSTF, SCAN,
+    LOOK, C-SCAN and C-LOOK).  ``arrivals`` (ms) must be ascending, with
+    ``cylinders`` in the same order; returns start and finish times in that
+    order, the stops starting at the head, and the total movement."""
+    lib = load_library()
+    cylinders = np.ascontiguousarray(cylinders, dtype=np.int32)
+    arrivals = np.ascontiguousarray(arrivals, dtype=np.float64)
+    n = cylinders.size
+    start = np.empty(n)
+    finish = np.empty(n)
+    path = np.empty(n + 1, dtype=np.int32)
+    path_length = ctypes.c_int()
+    total_movement = ctypes.c_longlong()
+    with profiling.phase("C library", algorithm=algorithm, requests=n):
+        status = lib.simulate_queue(algorithm.encode(), cylinders, arrivals, n, int(head),
+                                    int(disk_size), int(direction), seek_rate, per_request,
+                                    start, finish, path, ctypes.byref(path_length),
+                                    ctypes.byref(total_movement))
+    if status == DS_UNKNOWN_ALGORITHM:
+        raise ValueError(f"{algorithm} has no C event loop")
+    if status == DS_OUT_OF_MEMORY:
+        raise MemoryError("DiskScheduling library ran out of memory")
+    return start, finish, path[:path_length.value], total_movement.value
@@ -0,0 +1,76 @@
+"""Background execution of scheduling runs for interactive front ends.
+
+A Job runs a list of tasks off the calling thread and hands results back
+through a queue, so a GUI can poll it (e.g. with ``root.after``) and stay
+responsive.  Small jobs run on a daemon thread; heavy ones get a private
+process pool, which lets ``cancel`` stop work that is already running by
+terminating the workers.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+
+# Below this many requests a job runs on a thread; starting worker processes
+# costs more than running all eight algorithms
+PARALLEL_MIN_REQUESTS = 50_000
+
+
+class Job:
+    def __init__(self, tasks, use_processes=False):
+        """``tasks`` is a list of ``(label, function, args)``."""
+        self.tasks = list(tasks)
+        self.total = len(self.tasks)
+        self.completed = 0
+        self.cancelled = False
+        self.results = queue.Queue()
+        self.pool = None
+
+        if use_processes and self.total:
+            processes = min(self.total, os.cpu_count() or 1)
+            self.pool = multiprocessing.Pool(processes)
+            for label, func, args in self.tasks:
+                self.pool.apply_async(
+                    func, args,
+                    callback=lambda result, label=label: self.results.put((label, result, None)),
+                    error_callback=lambda error, label=label: self.results.put((label, None, error)),
+                )
+            self.pool.close()
+        else:
+            threading.Thread(target=self._run_tasks, daemon=True).start()
+
+    def _run_tasks(self):
+        for label, func, args in self.tasks:
+            if self.cancelled:
+                return
+            try:
+                result = func(*args)
+            except Exception as e:
+                self.results.put((label, None, e))
+            else:
+                self.results.put((label, result, None))
+
+    @property
+    def finished(self):
+        return self.cancelled or self.completed == self.total
+
+    def poll(self):
+        """Return the ``(label, result, error)`` tuples that arrived since the last poll."""
+        arrived = []
+        while not self.cancelled:
+            try:
+                arrived.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        self.completed += len(arrived)
+        if self.pool is not None and self.completed == self.total:
+            self.pool.join()
+            self.pool = None
+        return arrived
+
+    def cancel(self):
+        self.cancelled = True
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
@@ -0,0 +1,121 @@
+"""Run the compiled DiskScheduling program and read its binary results.
+
+The program is started with ``--binary``: it writes a 48-byte header
+(``RESULT_HEADER``) followed by the raw int32 service sequence.  The
+sequence is returned as a NumPy view over the captured stdout, so no
+per-element work happens in Python.  Large request lists are handed over
+as a temporary binary trace instead of command-line arguments.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+from . import profiling
+from .algorithms import ScheduleResult
+from .trace import save_trace
+
+RESULT_MAGIC = b"DSR1"
+RESULT_HEADER = np.dtype([
+    ("magic", "S4"),
+    ("seq_length", "<i4"),
+    ("total_movement", "<i8"),
+    ("seek_time", "<f8"),
+    ("rotational_latency", "<f8"),
+    ("transfer_time", "<f8"),
+    ("total_time", "<f8"),
+])
+
+# Algorithms implemented by DiskScheduling.c (and its shared library)
+NATIVE_ALGORITHMS = ("FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK")
+
+# Above this many requests the list goes through a trace file, which keeps
+# well clear of the Windows command-line limit (32k characters)
+MAX_ARGV_REQUESTS = 2000
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_executable():
+    exe = os.environ.get("DISKSCHED_EXE")
+    if exe:
+        return exe
+    name = "DiskScheduling.exe" if sys.platform == "win32" else "DiskScheduling"
+    return os.path.join(_ROOT, name)
+
+
+def parse_result(data):
+    """Decode ``--binary`` output into a ScheduleResult (zero-copy sequence)."""
+    buf = memoryview(data)
+    if len(buf) < RESULT_HEADER.itemsize or bytes(buf[:4]) != RESULT_MAGIC:
+        raise ValueError("C program returned empty or invalid output")
+    header = np.frombuffer(buf, dtype=RESULT_HEADER, count=1)[0]
+    seq_length = int(header["seq_length"])
+    if len(buf) != RESULT_HEADER.itemsize + 4 * seq_length:
+        raise ValueError(f"Expected {seq_length} sequence entries in C program output")
+    sequence = np.frombuffer(buf, dtype="<i4", count=seq_length, offset=RESULT_HEADER.itemsize)
+    return ScheduleResult(
+        int(header["total_movement"]),
+        float(header["seek_time"]),
+        float(header["rotational_latency"]),
+        float(header["transfer_time"]),
+        float(header["total_time"]),
+        sequence,
+    )
+
+
+def run_native(algorithm, requests=None, head=0, disk_size=200, direction=1,
+               trace=None, executable=None):
+    """Schedule with the C program; pass either ``requests`` or a ``trace`` path."""
+    cmd = [executable or default_executable(), "--binary", algorithm,
+           str(head), str(disk_size), str(direction)]
+    tmp_path = None
+    try:
+        if trace is not None:
+            cmd += ["--trace", os.fspath(trace)]
+        elif len(requests) > MAX_ARGV_REQUESTS:
+            fd, tmp_path = tempfile.mkstemp(suffix=".bin")
+            os.close(fd)
+            with profiling.phase("write trace"):
+                save_trace(tmp_path, requests)
+            cmd += ["--trace", tmp_path]
+        else:
+            cmd += [str(int(r)) for r in requests]
+
+        # Run with no console window on Windows
+        flags = subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+        with profiling.phase("C program", algorithm=algorithm):
+            try:
+                result = subprocess.run(cmd, capture_output=True, creationflags=flags)
+            except FileNotFoundError:
+                raise RuntimeError(f"C program not found: {cmd[0]} (build it from DiskScheduling.c, "
+                                   f"see the top of that file)") from None
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
+    if result.returncode != 0:
+        message = (result.stderr or result.stdout).decode(errors="replace").strip()
+        if message.startswith("Unknown algorithm: --"):
+            # A build from before --binary and --trace takes them for the algorithm
+            mode = message.split(": ", 1)[1]
+            message = f"{cmd[0]} is out of date (no {mode} mode); rebuild it from DiskScheduling.c"
+        raise RuntimeError(message or f"C program exited with status {result.returncode}")
+    with profiling.phase("parse output"):
+        return parse_result(result.stdout)
+
+
+def pack_result(result):
+    """Encode a ScheduleResult in the ``--binary`` layout."""
+    header = np.zeros(1, dtype=RESULT_HEADER)
+    header["magic"] = RESULT_MAGIC
+    header["seq_length"] = len(result.sequence)
+    header["total_movement"] = result.total_movement
+    header["seek_time"] = result.seek_time
+    header["rotational_latency"] = result.rotational_latency
+    header["transfer_time"] = result.transfer_time
+    header["total_time"] = result.total_time
+    return header.tobytes() + np.asarray(result.sequence, dtype="<i4").tobytes()
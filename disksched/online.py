@@ -0,0 +1,495 @@
+"""Online schedulers: requests are submitted one at a time while the head runs.
+
+The batch schedulers plan a whole request set at once, so a new arrival
+means planning again from scratch.  These keep their pending requests in a
+CylinderSet and pick the next stop from it directly; nothing already served
+is looked at again:
+
+    sched = online_scheduler("LOOK", head=53, disk_size=200)
+    sched.submit(98)            # request ids count up from 0
+    sched.submit(37)
+    sched.next()                # Dispatch(cylinder=98, requests=[0], distance=45)
+    sched.submit(120)
+    sched.next()                # Dispatch(cylinder=120, requests=[2], distance=22)
+
+Submitting is O(log n) and so is picking the next stop, with n the number
+of cylinders (SATF also examines the cylinders near enough to win, at one
+bisect each).  Every request pending on the cylinder the head stops at is served
+there, in submission order, except under SATF, which serves one request per
+stop.  ``now`` (ms) matters only to DEADLINE's expiry times and SATF's
+rotational position; simulate.simulate drives these objects with arrival
+times.
+"""
+
+from collections import deque
+from itertools import repeat
+from typing import List, NamedTuple
+
+from .algorithms import FIFO_BATCH, READ_EXPIRE, WRITE_EXPIRE, WRITES_STARVED, check_options
+from .rotational import DEFAULT_MODEL, PendingSectors
+
+
+class Dispatch(NamedTuple):
+    cylinder: int         # where the head stopped
+    requests: List[int]   # ids served there, as returned by submit()
+    distance: int         # cylinders moved, including trips to the disk edge
+
+
+class CylinderSet:
+    """Set of cylinders 0..size-1 with successor and predecessor queries.
+
+    A 64-way bitset tree: the bottom level has one bit per cylinder and each
+    level above one bit per non-empty word below, so every operation walks
+    at most log64(size) words (3 for a million cylinders).
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.levels = []
+        n = max(1, size)
+        while True:
+            n = (n + 63) >> 6
+            self.levels.append([0] * n)
+            if n == 1:
+                break
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, x):
+        return 0 <= x < self.size and bool(self.levels[0][x >> 6] >> (x & 63) & 1)
+
+    def add(self, x):
+        if not 0 <= x < self.size:
+            raise ValueError(f"{x} is outside 0-{self.size - 1}")
+        levels = self.levels
+        i = x >> 6
+        was = levels[0][i]
+        bit = 1 << (x & 63)
+        if was & bit:
+            return
+        self.count += 1
+        levels[0][i] = was | bit
+        for words in levels[1:]:
+            if was:  # the levels above already know this word is in use
+                return
+            x, i = i, i >> 6
+            was = words[i]
+            words[i] = was | (1 << (x & 63))
+
+    def discard(self, x):
+        if not 0 <= x < self.size:
+            return
+        levels = self.levels
+        i = x >> 6
+        bit = 1 << (x & 63)
+        if not levels[0][i] & bit:
+            return
+        self.count -= 1
+        left = levels[0][i] = levels[0][i] ^ bit
+        for words in levels[1:]:
+            if left:
+                return
+            x, i = i, i >> 6
+            left = words[i] = words[i] & ~(1 << (x & 63))
+
+    def successor(self, x):
+        """Smallest member >= x, or None."""
+        if x < 0:
+            x = 0
+        # Most queries end in the first word looked at
+        levels = self.levels
+        i = x >> 6
+        words = levels[0]
+        if i >= len(words):
+            return None
+        w = words[i] >> (x & 63)
+        if w:
+            return x + (w & -w).bit_length() - 1
+        x = i + 1
+        depth = 1
+        for words in levels[1:]:
+            i = x >> 6
+            if i >= len(words):
+                return None
+            w = words[i] >> (x & 63)
+            if w:
+                x += (w & -w).bit_length() - 1
+                break
+            x = i + 1
+            depth += 1
+        else:
+            return None
+        while depth:
+            depth -= 1
+            w = levels[depth][x]
+            x = (x << 6) + (w & -w).bit_length() - 1
+        return x
+
+    def predecessor(self, x):
+        """Largest member <= x, or None."""
+        if x >= self.size:
+            x = self.size - 1
+        if x < 0:
+            return None
+        levels = self.levels
+        i = x >> 6
+        w = levels[0][i] & ((2 << (x & 63)) - 1)
+        if w:
+            return (i << 6) + w.bit_length() - 1
+        if not i:
+            return None
+        x = i - 1
+        depth = 1
+        for words in levels[1:]:
+            i = x >> 6
+            w = words[i] & ((2 << (x & 63)) - 1)
+            if w:
+                x = (i << 6) + w.bit_length() - 1
+                break
+            if not i:
+                return None
+            x = i - 1
+            depth += 1
+        else:
+            return None
+        while depth:
+            depth -= 1
+            x = (x << 6) + levels[depth][x].bit_length() - 1
+        return x
+
+    def min(self):
+        return self.successor(0)
+
+    def max(self):
+        return self.predecessor(self.size - 1)
+
+
+class OnlineScheduler:
+    """Head state and bookkeeping shared by every policy."""
+
+    def __init__(self, head, disk_size=200, direction=1):
+        if not 0 <= head < disk_size:
+            raise ValueError(f"Head position must be between 0 and {disk_size - 1}")
+        self.head = int(head)
+        self.disk_size = int(disk_size)
+        self.direction = int(direction)
+        self.movement = 0     # cylinders moved so far
+        self.submitted = 0
+        self.pending = 0
+
+    def __len__(self):
+        return self.pending
+
+    def submit(self, cylinder, now=0.0, write=False, sector=0):
+        """Queue a request and return its id.  ``write`` is used by DEADLINE
+        and ``sector`` by SATF; the other policies ignore them."""
+        if not 0 <= cylinder < self.disk_size:
+            raise ValueError(f"Requests must be between 0 and {self.disk_size - 1}")
+        index = self.submitted
+        self._add(index, int(cylinder), now, write, sector)
+        self.submitted += 1
+        self.pending += 1
+        return index
+
+    def submit_many(self, cylinders, times, writes=None, sectors=None):
+        """submit() a run of requests (lists, one entry each) and return the
+        id of the first; the rest follow in order."""
+        first = index = self.submitted
+        if not cylinders:
+            return first
+        if min(cylinders) < 0 or max(cylinders) >= self.disk_size:
+            raise ValueError(f"Requests must be between 0 and {self.disk_size - 1}")
+        add = self._add
+        for cylinder, now, write, sector in zip(cylinders, times, writes or repeat(False),
+                                                 sectors or repeat(0)):
+            add(index, cylinder, now, write, sector)
+            index += 1
+        self.pending += index - first
+        self.submitted = index
+        return first
+
+    def next(self, now=0.0):
+        """Move the head to the next stop and serve it; None when idle."""
+        if not self.pending:
+            return None
+        cylinder, served, distance = self._pop(self.head, now)
+        self.head = cylinder
+        self.movement += distance
+        self.pending -= len(served)
+        return Dispatch(cylinder, served, distance)
+
+    def drain(self, now=0.0):
+        """Serve everything pending, yielding each Dispatch."""
+        while self.pending:
+            yield self.next(now)
+
+    def _add(self, index, cylinder, now, write, sector):
+        raise NotImplementedError
+
+    def _pop(self, pos, now):
+        raise NotImplementedError
+
+
+class FcfsScheduler(OnlineScheduler):
+    def __init__(self, head, disk_size=200, direction=1):
+        super().__init__(head, disk_size, direction)
+        self.queue = deque()
+
+    def _add(self, index, cylinder, now, write, sector):
+        self.queue.append((cylinder, index))
+
+    def _pop(self, pos, now):
+        cylinder, index = self.queue.popleft()
+        return cylinder, [index], abs(cylinder - pos)
+
+
+class _Buckets:
+    # Pending request ids by cylinder, with a CylinderSet of the cylinders
+    # that have any
+    def __init__(self, disk_size):
+        self.buckets = [None] * disk_size
+        self.cylinders = CylinderSet(disk_size)
+
+    def add(self, index, cylinder):
+        bucket = self.buckets[cylinder]
+        if bucket is None:
+            self.buckets[cylinder] = [index]
+            self.cylinders.add(cylinder)
+        else:
+            bucket.append(index)
+
+    def take(self, cylinder):
+        served = self.buckets[cylinder]
+        self.buckets[cylinder] = None
+        self.cylinders.discard(cylinder)
+        return served
+
+
+def _outward(step, x, delta):
+    # Members from x on, in the direction of step (successor or predecessor)
+    x = step(x)
+    while x is not None:
+        yield x
+        x = step(x + delta)
+
+
+class _CylinderScheduler(OnlineScheduler):
+    # pick() returns the chosen cylinder and the distance to it
+    def __init__(self, head, disk_size=200, direction=1):
+        super().__init__(head, disk_size, direction)
+        self.store = _Buckets(self.disk_size)
+        self.cylinders = self.store.cylinders
+
+    def _add(self, index, cylinder, now, write, sector):
+        self.store.add(index, cylinder)
+
+    def _pop(self, pos, now):
+        cylinder, distance = self.pick(pos)
+        return cylinder, self.store.take(cylinder), distance
+
+    def pick(self, pos):
+        raise NotImplementedError
+
+
+class SstfScheduler(_CylinderScheduler):
+    def pick(self, pos):
+        right = self.cylinders.successor(pos)
+        left = self.cylinders.predecessor(pos - 1)
+        if right is None:
+            return left, pos - left
+        if left is not None:
+            dl, dr = pos - left, right - pos
+            buckets = self.store.buckets
+            # Ties go to whichever was queued first, as in the batch SSTF
+            if dl < dr or (dl == dr and buckets[left][0] < buckets[right][0]):
+                return left, dl
+        return right, right - pos
+
+
+class LookScheduler(_CylinderScheduler):
+    # SCAN additionally runs to the disk edge before reversing
+    to_edge = False
+
+    def pick(self, pos):
+        cylinders = self.cylinders
+        if self.direction == 1:
+            cylinder = cylinders.successor(pos)
+            if cylinder is not None:
+                return cylinder, cylinder - pos
+            self.direction = 0
+            cylinder = cylinders.max()
+            edge = self.disk_size - 1
+            if self.to_edge and pos != edge:
+                return cylinder, (edge - pos) + (edge - cylinder)
+            return cylinder, pos - cylinder
+        cylinder = cylinders.predecessor(pos)
+        if cylinder is not None:
+            return cylinder, pos - cylinder
+        self.direction = 1
+        cylinder = cylinders.min()
+        if self.to_edge and pos != 0:
+            return cylinder, pos + cylinder
+        return cylinder, cylinder - pos
+
+
+class ScanScheduler(LookScheduler):
+    to_edge = True
+
+
+class ClookScheduler(_CylinderScheduler):
+    # C-SCAN additionally runs to the edge and counts the return
+    to_edge = False
+
+    def pick(self, pos):
+        cylinders = self.cylinders
+        last = self.disk_size - 1
+        if self.direction == 1:
+            cylinder = cylinders.successor(pos)
+            if cylinder is not None:
+                return cylinder, cylinder - pos
+            cylinder = cylinders.min()
+            if self.to_edge:
+                return cylinder, (last - pos) + last + cylinder
+            return cylinder, pos - cylinder
+        cylinder = cylinders.predecessor(pos)
+        if cylinder is not None:
+            return cylinder, pos - cylinder
+        cylinder = cylinders.max()
+        if self.to_edge:
+            return cylinder, pos + last + (last - cylinder)
+        return cylinder, cylinder - pos
+
+
+class CscanScheduler(ClookScheduler):
+    to_edge = True
+
+
+class DeadlineScheduler(OnlineScheduler):
+    """Linux mq-deadline: reads and writes each have an elevator (ascending
+    cylinder order) and a FIFO of expiry times.  The head serves up to
+    ``fifo_batch`` requests in elevator order, then picks a direction (reads,
+    unless writes have been passed over ``writes_starved`` times) and jumps
+    to the oldest request of that direction if it has expired."""
+
+    _READ, _WRITE = 0, 1
+
+    def __init__(self, head, disk_size=200, direction=1, read_expire=READ_EXPIRE,
+                 write_expire=WRITE_EXPIRE, fifo_batch=FIFO_BATCH, writes_starved=WRITES_STARVED):
+        if fifo_batch < 1:
+            raise ValueError("fifo_batch must be at least 1")
+        super().__init__(head, disk_size, direction)
+        self.sorted = (_Buckets(self.disk_size), _Buckets(self.disk_size))
+        self.fifo = (deque(), deque())   # (expires, index, cylinder) in arrival order
+        self.expire = (read_expire, write_expire)
+        self.fifo_batch = fifo_batch
+        self.writes_starved = writes_starved
+        self.dispatched = set()   # served through the elevator, still in a FIFO
+        self.data_dir = self._READ
+        self.batching = 0
+        self.starved = 0
+
+    def _add(self, index, cylinder, now, write, sector):
+        d = self._WRITE if write else self._READ
+        self.sorted[d].add(index, cylinder)
+        self.fifo[d].append((now + self.expire[d], index, cylinder))
+
+    def _pop(self, pos, now):
+        d = self.data_dir
+        if self.batching < self.fifo_batch:
+            # Keep going up the current elevator while the batch lasts
+            cylinder = self.sorted[d].cylinders.successor(pos)
+            if cylinder is not None:
+                return self._dispatch(d, cylinder, pos)
+
+        reads, writes = len(self.sorted[0].cylinders), len(self.sorted[1].cylinders)
+        if reads and (not writes or self.starved < self.writes_starved):
+            if writes:
+                self.starved += 1
+            d = self._READ
+        else:
+            self.starved = 0
+            d = self._WRITE
+        self.data_dir = d
+        self.batching = 0
+
+        fifo = self.fifo[d]
+        while fifo[0][1] in self.dispatched:
+            self.dispatched.discard(fifo.popleft()[1])
+        cylinder = self.sorted[d].cylinders.successor(pos)
+        if fifo[0][0] <= now or cylinder is None:
+            # Expired, or the elevator ran off the end: restart at the oldest request
+            cylinder = fifo[0][2]
+        return self._dispatch(d, cylinder, pos)
+
+    def _dispatch(self, d, cylinder, pos):
+        served = self.sorted[d].take(cylinder)
+        self.dispatched.update(served)
+        self.batching += len(served)
+        return cylinder, served, abs(cylinder - pos)
+
+
+class SatfScheduler(OnlineScheduler):
+    """Shortest access time first under a rotational.DiskModel: the platter
+    turns from sector 0 at t=0, and the next request is whichever the head
+    can reach soonest from where it is at ``now``, counting seek and
+    rotation.  Picks go through rotational.PendingSectors, as in
+    rotational.satf_order, so only cylinders whose seek alone could still
+    win are examined, and one bisect each."""
+
+    def __init__(self, head, disk_size=200, direction=1, model=DEFAULT_MODEL):
+        super().__init__(head, disk_size, direction)
+        self.model = model
+        self.finish = 0.0   # ms at which the last dispatched request completes
+        self.store = PendingSectors(self.disk_size, model)
+        self.cylinders = CylinderSet(self.disk_size)
+
+    def _add(self, index, cylinder, now, write, sector):
+        if not 0 <= sector < self.model.track_size:
+            raise ValueError(f"Sectors must lie in 0-{self.model.track_size - 1}")
+        self.store.add(cylinder, sector, index)
+        self.cylinders.add(cylinder)
+
+    def _pop(self, pos, now):
+        below = _outward(self.cylinders.predecessor, pos - 1, -1)
+        above = _outward(self.cylinders.successor, pos, 1)
+        cost, cylinder, start = self.store.pick(pos, now, below, above)
+        self.finish = now + (cost + self.model.sector_time)
+        index = self.store.take(cylinder, start)
+        if cylinder not in self.store:
+            self.cylinders.discard(cylinder)
+        return cylinder, [index], abs(cylinder - pos)
+
+    def drain(self, now=0.0):
+        # Each request starts when the one before it completes
+        while self.pending:
+            yield self.next(now)
+            now = self.finish
+
+
+SCHEDULERS = {
+    "FCFS": FcfsScheduler,
+    "SSTF": SstfScheduler,
+    "SCAN": ScanScheduler,
+    "LOOK": LookScheduler,
+    "C-SCAN": CscanScheduler,
+    "C-LOOK": ClookScheduler,
+    "DEADLINE": DeadlineScheduler,
+    "SATF": SatfScheduler,
+}
+
+
+def online_scheduler(algorithm, head, disk_size=200, direction=1, **options):
+    """A fresh scheduler for ``algorithm``.  ``options`` are its tunables
+    (algorithms.OPTIONS) except the per-request ones, writes and sectors,
+    which are given to submit() instead."""
+    try:
+        scheduler_type = SCHEDULERS[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}") from None
+    check_options(algorithm, options)
+    per_request = sorted({"writes", "sectors"} & set(options))
+    if per_request:
+        raise ValueError(f"{', '.join(per_request)} go to submit(), one request at a time")
+    return scheduler_type(head, disk_size, direction, **options)
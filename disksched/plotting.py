@@ -0,0 +1,126 @@
+"""Level-of-detail rendering of long service sequences.
+
+Drawing one arrow artist per step stops working past a few thousand steps.
+The views here draw the whole path as one LineCollection decimated to the
+pixel size of the axes (min/max per pixel bucket, so every excursion stays
+visible), add quiver arrows and point labels only once the visible range
+is small, and re-render whenever the user zooms or pans.
+"""
+
+import numpy as np
+from matplotlib.collections import LineCollection
+
+# Sequences longer than this use the views below instead of per-step artists
+LARGE_SEQUENCE = 1000
+# Per-step arrows and labels are drawn only when this few steps are visible
+ARROW_LIMIT = 200
+LABEL_LIMIT = 60
+
+
+def decimate(values, buckets):
+    """Indices of ``values`` keeping first, min, max and last of each bucket.
+
+    Drawing only these points gives the same image as drawing every point
+    when each bucket is at most one pixel wide.
+    """
+    n = len(values)
+    if n <= 4 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets)
+    padded = np.pad(np.asarray(values), (0, size * buckets - n), mode="edge").reshape(buckets, size)
+    starts = np.arange(buckets) * size
+    picks = np.stack([
+        starts,
+        starts + padded.argmin(axis=1),
+        starts + padded.argmax(axis=1),
+        starts + size - 1,
+    ], axis=1)
+    picks.sort(axis=1)
+    picks = np.minimum(picks.ravel(), n - 1)
+    keep = np.empty(picks.size, dtype=bool)
+    keep[0] = True
+    np.not_equal(picks[1:], picks[:-1], out=keep[1:])
+    return picks[keep]
+
+
+def _visible_range(lo, hi, n):
+    start = max(0, int(np.floor(min(lo, hi))))
+    stop = min(n, int(np.ceil(max(lo, hi))) + 1)
+    return start, max(start, stop)
+
+
+class SeekPathView:
+    """Head movement on ``ax``: cylinder on x, step number on y."""
+
+    def __init__(self, ax, sequence, color="red"):
+        self.ax = ax
+        self.sequence = np.asarray(sequence)
+        self.color = color
+        self.path = LineCollection([], colors=color, linewidths=1.5, alpha=0.7)
+        ax.add_collection(self.path)
+        self.arrows = None
+        self.render()
+        ax.callbacks.connect("ylim_changed", self.on_zoom)
+
+    def on_zoom(self, ax):
+        self.render()
+        ax.figure.canvas.draw_idle()
+
+    def render(self):
+        start, stop = _visible_range(*self.ax.get_ylim(), len(self.sequence))
+        # Include one step either side so the path runs off the edges
+        start, stop = max(0, start - 1), min(len(self.sequence), stop + 1)
+        visible = self.sequence[start:stop]
+        pixels = max(1, int(self.ax.get_window_extent().height))
+        steps = decimate(visible, pixels)
+        self.path.set_segments([np.column_stack([visible[steps], steps + start])])
+
+        if self.arrows is not None:
+            self.arrows.remove()
+            self.arrows = None
+        if 1 < len(visible) <= ARROW_LIMIT:
+            x = visible[:-1]
+            y = np.arange(start, stop - 1)
+            self.arrows = self.ax.quiver(x, y, np.diff(visible), np.ones(len(x)),
+                                         angles="xy", scale_units="xy", scale=1,
+                                         color=self.color, alpha=0.7, width=0.003)
+
+
+class TimelineView:
+    """Served cylinder per service order on ``ax`` as a step plot."""
+
+    def __init__(self, ax, served, color="purple", label=None):
+        self.ax = ax
+        self.served = np.asarray(served)
+        self.line, = ax.plot([], [], drawstyle="steps-post", color=color, label=label)
+        self.markers = None
+        self.labels = []
+        self.render()
+        ax.callbacks.connect("xlim_changed", self.on_zoom)
+
+    def on_zoom(self, ax):
+        self.render()
+        ax.figure.canvas.draw_idle()
+
+    def render(self):
+        start, stop = _visible_range(*self.ax.get_xlim(), len(self.served))
+        start, stop = max(0, start - 1), min(len(self.served), stop + 1)
+        visible = self.served[start:stop]
+        pixels = max(1, int(self.ax.get_window_extent().width))
+        order = decimate(visible, pixels)
+        self.line.set_data(order + start, visible[order])
+
+        if self.markers is not None:
+            self.markers.remove()
+            self.markers = None
+        for label in self.labels:
+            label.remove()
+        self.labels = []
+        if len(visible) <= ARROW_LIMIT:
+            self.markers = self.ax.scatter(np.arange(start, stop), visible, color="red", alpha=0.7)
+        if len(visible) <= LABEL_LIMIT:
+            self.labels = [
+                self.ax.annotate(f"{y}", (x, y), textcoords="offset points",
+                                 xytext=(0, 8), ha="center", fontsize=8)
+                for x, y in zip(range(start, stop), visible.tolist())
+            ]
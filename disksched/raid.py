@@ -0,0 +1,185 @@
+"""Disk arrays: a logical request trace spread over several simulated disks.
+
+Logical addresses are mapped onto member disks in chunks of ``chunk``
+cylinders:
+
+* RAID-0 stripes chunks across all disks;
+* RAID-1 mirrors every disk; reads go to the mirrors in turn and writes to
+  all of them;
+* RAID-5 stripes over N-1 data chunks per row with the parity chunk
+  rotating from the last disk down (left-symmetric).  A write is a small
+  write: read old data and parity, then write both.
+
+Every disk then runs the scheduler on its own share of the trace (see
+simulate.simulate), each in its own worker process, and a logical request
+finishes when the last of its disk accesses does:
+
+    layout = Layout(level=5, disks=4, chunk=16, disk_size=200)
+    array = simulate_array(layout, "LOOK", requests, arrivals, head=50, writes=writes)
+    summarize(array)            # array-level throughput and latency
+    array.disks[2].sequence     # seek pattern of one member disk
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from . import profiling
+from .algorithms import OPTIONS, SEQUENCE_DTYPE
+from .jobs import PARALLEL_MIN_REQUESTS
+from .simulate import SimulationResult, queue_depth_steps, simulate
+
+LEVELS = (0, 1, 5)
+
+
+class Layout(NamedTuple):
+    level: int
+    disks: int
+    chunk: int = 16        # cylinders per chunk
+    disk_size: int = 200   # cylinders per member disk
+
+    @property
+    def capacity(self):
+        """Logical cylinders the array exposes."""
+        if self.level == 1:
+            return self.disk_size
+        chunks = self.disk_size // self.chunk
+        data_disks = self.disks - 1 if self.level == 5 else self.disks
+        return chunks * self.chunk * data_disks
+
+    def check(self):
+        if self.level not in LEVELS:
+            raise ValueError(f"RAID level must be one of {', '.join(map(str, LEVELS))}")
+        minimum = {0: 1, 1: 2, 5: 3}[self.level]
+        if self.disks < minimum:
+            raise ValueError(f"RAID-{self.level} needs at least {minimum} disks")
+        if not 1 <= self.chunk <= self.disk_size:
+            raise ValueError(f"Chunk size must be between 1 and {self.disk_size}")
+
+
+class Share(NamedTuple):
+    # One member disk's accesses, in logical request order
+    owner: np.ndarray       # logical request index of each access
+    requests: np.ndarray    # cylinders on this disk
+    writes: np.ndarray      # bool
+
+
+class ArrayResult(NamedTuple):
+    arrival: np.ndarray     # ms, logical requests in input order
+    start: np.ndarray       # ms, when the first of the request's accesses started
+    finish: np.ndarray      # ms, when the last of them finished
+    response_time: np.ndarray
+    total_movement: int     # summed over the disks
+    makespan: float
+    queue_times: np.ndarray
+    queue_depth: np.ndarray   # outstanding logical requests
+    layout: Layout
+    shares: List[Share]
+    disks: List[Optional[SimulationResult]]   # None for a disk that got no accesses
+
+
+def split(layout, requests, writes=None):
+    """Map logical requests onto the member disks; one Share per disk."""
+    layout.check()
+    logical = np.asarray(requests, dtype=np.int64)
+    if logical.ndim != 1 or logical.size == 0:
+        raise ValueError("requests must be a non-empty 1-D sequence of cylinders")
+    if logical.min() < 0 or logical.max() >= layout.capacity:
+        raise ValueError(f"Requests must be between 0 and {layout.capacity - 1} for this array")
+    if writes is None:
+        writes = np.zeros(logical.size, dtype=bool)
+    else:
+        writes = np.asarray(writes, dtype=bool)
+        if writes.shape != logical.shape:
+            raise ValueError("writes must give one flag per request")
+
+    n, chunk, disks = logical.size, layout.chunk, layout.disks
+    index = np.arange(n)
+    parts = []   # (disk, owner, cylinder, write) arrays
+    if layout.level == 0:
+        stripe = logical // chunk
+        parts.append((stripe % disks, index, (stripe // disks) * chunk + logical % chunk, writes))
+    elif layout.level == 1:
+        reads = ~writes
+        parts.append((index[reads] % disks, index[reads], logical[reads], writes[reads]))
+        for disk in range(disks):
+            parts.append((np.full(int(writes.sum()), disk), index[writes], logical[writes],
+                          writes[writes]))
+    else:
+        data_disks = disks - 1
+        row = logical // (chunk * data_disks)
+        parity = data_disks - row % disks
+        disk = (parity + 1 + (logical // chunk) % data_disks) % disks
+        cylinder = row * chunk + logical % chunk
+        w = writes
+        old = np.zeros(int(w.sum()), dtype=bool)
+        parts.append((disk[w], index[w], cylinder[w], old))       # read old data
+        parts.append((parity[w], index[w], cylinder[w], old))     # read old parity
+        parts.append((disk, index, cylinder, writes))             # the request itself
+        parts.append((parity[w], index[w], cylinder[w], ~old))    # write new parity
+
+    disk, owner, cylinder, write = (np.concatenate(column) for column in zip(*parts))
+    order = np.lexsort((owner, disk))
+    disk, owner, cylinder, write = disk[order], owner[order], cylinder[order], write[order]
+    bounds = np.searchsorted(disk, np.arange(disks + 1))
+    return [Share(owner[lo:hi], cylinder[lo:hi].astype(SEQUENCE_DTYPE), write[lo:hi])
+            for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def simulate_share(algorithm, share, arrivals, head, disk_size=200, direction=1, **options):
+    """simulate() one member disk's share, whose accesses arrive at
+    ``arrivals``; None when the disk has nothing to do."""
+    if not share.owner.size:
+        return None
+    if "writes" in OPTIONS.get(algorithm, ()):
+        options["writes"] = share.writes
+    return simulate(algorithm, share.requests, arrivals, head, disk_size, direction, **options)
+
+
+def merge(layout, arrivals, shares, results):
+    """Combine per-disk simulations into an ArrayResult."""
+    arrival = np.asarray(arrivals, dtype=np.float64)
+    start = np.full(arrival.size, np.inf)
+    finish = np.zeros(arrival.size)
+    movement = 0
+    for share, result in zip(shares, results):
+        if result is None:
+            continue
+        np.minimum.at(start, share.owner, result.start)
+        np.maximum.at(finish, share.owner, result.finish)
+        movement += result.total_movement
+    queue_times, queue_depth = queue_depth_steps(arrival, finish)
+    return ArrayResult(arrival, start, finish, finish - arrival, movement, float(finish.max()),
+                       queue_times, queue_depth, layout, list(shares), list(results))
+
+
+def simulate_array(layout, algorithm, requests, arrivals, head, direction=1, writes=None,
+                   processes=None, **options):
+    """Serve a logical trace on ``layout``, one worker process per member disk.
+
+    ``head`` and ``direction`` are the starting state of every disk.  Small
+    traces, and any trace with ``processes=1``, run the disks one after
+    another in the calling process.
+    """
+    arrivals = np.asarray(arrivals, dtype=np.float64)
+    if arrivals.shape != np.shape(requests):
+        raise ValueError("arrivals must give one time per request")
+    with profiling.phase("split", disks=layout.disks):
+        shares = split(layout, requests, writes)
+    if not 0 <= head < layout.disk_size:
+        raise ValueError(f"Head position must be between 0 and {layout.disk_size - 1}")
+
+    args = [(algorithm, share, arrivals[share.owner], head, layout.disk_size, direction)
+            for share in shares]
+    busy = sum(1 for share in shares if share.owner.size)
+    if processes == 1 or busy < 2 or arrivals.size < PARALLEL_MIN_REQUESTS:
+        results = [simulate_share(*a, **options) for a in args]
+    else:
+        workers = min(busy, processes or os.cpu_count() or 1)
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(simulate_share, *a, **options) for a in args]
+            results = [future.result() for future in futures]
+    with profiling.phase("merge disks"):
+        return merge(layout, arrivals, shares, results)
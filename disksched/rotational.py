@@ -0,0 +1,317 @@
+"""Rotational-position-aware access timing and SATF scheduling.
+
+ScheduleResult times follow DiskScheduling.c: movement times SEEK_RATE
+plus one average rotational latency for the whole run, so the time ranking
+of the algorithms is just their movement ranking.  Here every request has a
+cylinder and a sector, and each step is timed on its own:
+
+* seek: 0 for the same cylinder, otherwise a settle time plus a square-root
+  curve for short seeks that turns into SEEK_RATE per cylinder past
+  ``seek_knee`` cylinders;
+* rotation: the platter turns continuously from sector 0 at t=0, and the
+  head waits until the request's sector comes round;
+* transfer: one sector passing under the head.
+
+    result, timed = timed_schedule("LOOK", cyls, 53, sectors=sectors)
+    timed.total_time, timed.finish    # ms, per step
+    result, timed = timed_schedule("SATF", cyls, 53, sectors=sectors)
+
+SATF (shortest access time first) picks whichever pending request can be
+reached soonest counting both seek and rotation.  The seek part comes from
+a per-distance table computed once per disk size.  Cylinders are examined
+nearest first and only while their seek alone could still win, and on
+each one the soonest sector is a bisect into its sorted pending sectors
+(PendingSectors), so a pick costs neither the queue's length nor the
+disk's size.
+"""
+
+import bisect
+import functools
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+
+from . import profiling
+from .algorithms import RPM, SEEK_RATE, TRACK_SIZE
+
+
+class DiskModel(NamedTuple):
+    rpm: float = RPM
+    track_size: int = TRACK_SIZE   # sectors per track
+    seek_rate: float = SEEK_RATE   # ms per cylinder on long seeks
+    settle: float = 1.0            # ms paid by every non-zero seek
+    seek_knee: int = 25            # cylinders; shorter seeks follow a sqrt curve
+
+    @property
+    def rotation(self):
+        return 60.0 * 1000 / self.rpm
+
+    @property
+    def sector_time(self):
+        return self.rotation / self.track_size
+
+    def seek_time(self, distance):
+        """Seek time in ms for an array of cylinder distances."""
+        d = np.asarray(distance, dtype=np.float64)
+        # The sqrt branch meets the linear one with the same slope at the knee
+        short = self.settle + 2 * self.seek_rate * np.sqrt(self.seek_knee * d)
+        long = self.settle + self.seek_rate * (d + self.seek_knee)
+        return np.where(d == 0, 0.0, np.where(d < self.seek_knee, short, long))
+
+
+DEFAULT_MODEL = DiskModel()
+
+# A sector due "now" can come out a hair under a full revolution away in
+# floating point; anything this close to a revolution counts as no wait
+WAIT_EPS = 1e-9
+
+
+class AccessTimes(NamedTuple):
+    seek_time: float            # ms, totals over the run
+    rotational_latency: float
+    transfer_time: float
+    total_time: float
+    order: np.ndarray           # request indices in service order
+    finish: np.ndarray          # ms at which each of ``order`` completes
+
+
+@functools.lru_cache(maxsize=16)
+def access_table(disk_size, model=DEFAULT_MODEL):
+    """Seek time (ms) by cylinder distance."""
+    seek = model.seek_time(np.arange(disk_size))
+    seek.flags.writeable = False
+    return seek
+
+
+def _as_sectors(sectors, n, model):
+    sectors = np.asarray(sectors, dtype=np.int64)
+    if sectors.shape != (n,):
+        raise ValueError("sectors must give one sector per request")
+    if sectors.size and (sectors.min() < 0 or sectors.max() >= model.track_size):
+        raise ValueError(f"Sectors must lie in 0-{model.track_size - 1}")
+    return sectors
+
+
+def _visits(sequence, requests):
+    # The first stop at a cylinder serves every request on it, as in the
+    # batch schedulers; later stops there (return sweeps) only pass through.
+    # Returns the serving steps, the requests in service order and how many
+    # each serving step takes.
+    steps = sequence[1:]
+    by_cylinder = np.argsort(requests, kind="stable")
+    sorted_requests = requests[by_cylinder]
+    first = np.searchsorted(sorted_requests, steps, side="left")
+    count = np.searchsorted(sorted_requests, steps, side="right") - first
+
+    stops = np.zeros(steps.size, dtype=bool)
+    stops[np.unique(steps, return_index=True)[1]] = True
+    stops &= count > 0
+    sizes = count[stops]
+    if sizes.sum() != requests.size:
+        raise ValueError("sequence does not visit every request")
+    offsets = np.cumsum(sizes) - sizes
+    order = by_cylinder[np.repeat(first[stops] - offsets, sizes) + np.arange(requests.size)]
+    return stops, order, sizes
+
+
+def access_times(sequence, requests, sectors=None, model=DEFAULT_MODEL, disk_size=None, order=None):
+    """Time a service sequence step by step.
+
+    Without ``sectors`` the angular positions are unknown and every request
+    waits the average half revolution.  With them, the head waits for the
+    actual sector, and requests sharing a stop are taken in the order their
+    sectors come round.  ``order`` pins the request served at each step
+    (one per step), as satf_order produces.
+    """
+    requests = np.asarray(requests, dtype=np.int64)
+    sequence = np.asarray(sequence, dtype=np.int64)
+    if disk_size is None:
+        disk_size = int(max(sequence.max(), requests.max())) + 1
+    step_seek = access_table(int(disk_size), model)[np.abs(np.diff(sequence))]
+
+    if order is not None:
+        order = np.asarray(order, dtype=np.intp)
+        if not np.array_equal(requests[order], sequence[1:]):
+            raise ValueError("order does not match the sequence")
+        stops = np.ones(order.size, dtype=bool)
+        sizes = np.ones(order.size, dtype=np.int64)
+    else:
+        stops, order, sizes = _visits(sequence, requests)
+
+    if sectors is not None:
+        sectors = _as_sectors(sectors, requests.size, model)
+        with profiling.phase("access timing", requests=int(requests.size)):
+            return _positional_times(step_seek, stops, order, sizes, sectors, model)
+
+    # Pass-through moves (edge turns, revisits) add to the next stop's seek,
+    # which the first request served there pays; moves after the last stop
+    # are not waited on by anyone
+    group = np.cumsum(stops) - stops
+    stop_seek = np.bincount(group, weights=step_seek, minlength=sizes.size + 1)[:sizes.size]
+    seek = np.zeros(requests.size)
+    seek[np.cumsum(sizes) - sizes] = stop_seek
+    rotational = np.full(requests.size, model.rotation / 2)
+    finish = np.cumsum(seek + rotational + model.sector_time)
+    return AccessTimes(float(seek.sum()), float(rotational.sum()),
+                       requests.size * model.sector_time, float(finish[-1]), order, finish)
+
+
+def _positional_times(step_seek, stops, order, sizes, sectors, model):
+    rotation, sector_time = model.rotation, model.sector_time
+    starts = (sectors * sector_time).tolist()
+    groups = iter(np.split(order, np.cumsum(sizes)[:-1]))
+
+    served = []
+    finish = []
+    t = moving = seek_total = wait_total = 0.0
+    for seek, stop in zip(step_seek.tolist(), stops.tolist()):
+        moving += seek
+        if not stop:
+            continue
+        pending = next(groups).tolist()
+        while pending:
+            # Same arithmetic as satf_order, so SATF orders re-time exactly
+            arrive = t + moving
+            waits = [(starts[index] - arrive) % rotation for index in pending]
+            waits = [0.0 if w > rotation - WAIT_EPS else w for w in waits]
+            k = min(range(len(pending)), key=waits.__getitem__)
+            t += (moving + waits[k]) + sector_time
+            seek_total += moving
+            wait_total += waits[k]
+            moving = 0.0
+            served.append(pending.pop(k))
+            finish.append(t)
+
+    return AccessTimes(seek_total, wait_total, len(served) * sector_time, t,
+                       np.asarray(served, dtype=np.intp), np.asarray(finish))
+
+
+@functools.lru_cache(maxsize=16)
+def _seek_list(disk_size, model):
+    return access_table(disk_size, model).tolist()
+
+
+class PendingSectors:
+    """Pending SATF requests by cylinder and sector.
+
+    Each cylinder keeps its distinct pending start times (ms into a
+    revolution) sorted, so the request whose sector comes round first is a
+    bisect away however many wait there.  Requests on one sector leave in
+    the order they were added.  Which cylinders are occupied is left to the
+    caller, who hands pick() the nearby ones nearest first.
+    """
+
+    def __init__(self, disk_size, model=DEFAULT_MODEL):
+        self.rotation = model.rotation
+        self.sector_time = model.sector_time
+        self.seek_table = _seek_list(disk_size, model)
+        self.starts = {}   # cylinder -> sorted distinct start times
+        self.queues = {}   # (cylinder, start) -> deque of items
+
+    def __contains__(self, cylinder):
+        return cylinder in self.starts
+
+    def add(self, cylinder, sector, item):
+        start = sector * self.sector_time
+        queue = self.queues.get((cylinder, start))
+        if queue is None:
+            queue = self.queues[cylinder, start] = deque()
+            bisect.insort(self.starts.setdefault(cylinder, []), start)
+        queue.append(item)
+
+    def take(self, cylinder, start):
+        """Remove and return the oldest item waiting for ``start`` on ``cylinder``."""
+        queue = self.queues[cylinder, start]
+        item = queue.popleft()
+        if not queue:
+            del self.queues[cylinder, start]
+            starts = self.starts[cylinder]
+            del starts[bisect.bisect_left(starts, start)]
+            if not starts:
+                del self.starts[cylinder]
+        return item
+
+    def soonest(self, cylinder, arrive):
+        """(wait, start) of the first pending sector on ``cylinder`` to come
+        under a head arriving there at ``arrive`` ms."""
+        starts, rotation = self.starts[cylinder], self.rotation
+        j = bisect.bisect_left(starts, arrive % rotation)
+        # Waits grow with the start time from the angle the head arrives at,
+        # so the minimum is the first start past it or, within rounding, the
+        # one just before
+        best = None
+        for start in (starts[j - 1], starts[j] if j < len(starts) else starts[0]):
+            wait = (start - arrive) % rotation
+            if wait > rotation - WAIT_EPS:
+                wait = 0.0
+            if best is None or wait < best[0]:
+                best = (wait, start)
+        return best
+
+    def pick(self, pos, now, below, above):
+        """(cost, cylinder, start) of the request the head at ``pos`` can
+        reach soonest at ``now`` ms.  ``below`` and ``above`` iterate the
+        occupied cylinders under ``pos`` downward and from ``pos`` upward;
+        they are read only while a cylinder's seek alone could still win.
+        Ties go to the lower cylinder, then the earlier request."""
+        seek_table = self.seek_table
+        low, high = next(below, None), next(above, None)
+        best = None
+        while low is not None or high is not None:
+            if high is None or (low is not None and pos - low <= high - pos):
+                cylinder, low = low, next(below, None)
+            else:
+                cylinder, high = high, next(above, None)
+            seek = seek_table[abs(cylinder - pos)]
+            if best is not None and seek > best[0]:
+                break   # seeks only grow from here
+            wait, start = self.soonest(cylinder, now + seek)
+            cost = seek + wait
+            if best is None or cost < best[0] or (cost == best[0] and cylinder < best[1]):
+                best = (cost, cylinder, start)
+        return best
+
+
+def timed_schedule(algorithm, requests, head, disk_size=200, direction=1, sectors=None,
+                   model=DEFAULT_MODEL, **options):
+    """schedule() plus its AccessTimes under ``model``."""
+    from .algorithms import ScheduleResult, check_options, compute_times, schedule, seek_distance
+    if algorithm == "SATF":
+        check_options(algorithm, options)
+        requests = np.asarray(requests, dtype=np.int64)
+        if sectors is None:
+            sectors = np.zeros(requests.size, dtype=np.int64)
+        order = satf_order(requests, sectors, head, disk_size, model)
+        sequence = np.concatenate([[head], requests[order]]).astype(np.int32)
+        movement = seek_distance(sequence)
+        result = ScheduleResult(movement, *compute_times(movement, requests.size), sequence)
+    else:
+        result = schedule(algorithm, requests, head, disk_size, direction, **options)
+        order = None
+    return result, access_times(result.sequence, requests, sectors, model, disk_size, order)
+
+
+def satf_order(requests, sectors, head, disk_size=200, model=DEFAULT_MODEL):
+    """Request indices in shortest-access-time-first order."""
+    requests = np.asarray(requests, dtype=np.int64)
+    n = requests.size
+    sectors = _as_sectors(sectors, n, model)
+    pending = PendingSectors(int(disk_size), model)
+    for index, (cylinder, sector) in enumerate(zip(requests.tolist(), sectors.tolist())):
+        pending.add(cylinder, sector, index)
+    occupied = sorted(pending.starts)   # cylinders with requests left
+    sector_time = model.sector_time
+
+    order = []
+    pos, t = int(head), 0.0
+    for _ in range(n):
+        i = bisect.bisect_left(occupied, pos)
+        below = (occupied[j] for j in range(i - 1, -1, -1))
+        above = (occupied[j] for j in range(i, len(occupied)))
+        cost, pos, start = pending.pick(pos, t, below, above)
+        t += cost + sector_time
+        order.append(pending.take(pos, start))
+        if pos not in pending:
+            del occupied[bisect.bisect_left(occupied, pos)]
+    return np.asarray(order, dtype=np.intp)
@@ -0,0 +1,237 @@
+"""Discrete-event simulation of a disk serving requests that arrive over time.
+
+The batch schedulers in algorithms.py assume every request is queued at
+t=0.  Here each request has an arrival time (ms), the head serves one
+cylinder at a time, and the policy picks the next cylinder from whatever is
+pending each time the head goes idle:
+
+    result = simulate("SSTF", cylinders, arrivals, head=50, disk_size=200)
+    result.response_time        # per request, in input order
+    latency_percentiles(result.response_time)   # {"p50": ..., "p95": ..., "p99": ...}
+
+Every request pays its own seek, average rotational latency and transfer
+time (the same constants as DiskScheduling.c).  Requests pending on the
+cylinder the head stops at are served back to back in arrival order.
+Movement counts the whole head path, including SCAN/C-SCAN trips to the
+disk edge.
+
+The policies are the online schedulers of online.py: each arrival is
+submitted as it comes, and the head asks for its next stop whenever it goes
+idle.  FCFS needs no such loop, as it serves requests in arrival order, and
+is computed with array operations.  ``clib=True`` runs the loop of SSTF,
+SCAN, LOOK, C-SCAN and C-LOOK in the shared library (disksched.clib), with
+identical results.  Five million requests (ten million events) then take
+about a second on one core, against 30-40 s in the Python loop, which is
+the only one DEADLINE has.
+"""
+
+import bisect
+from typing import NamedTuple
+
+import numpy as np
+
+from .algorithms import (RPM, SECTOR_SIZE, SEEK_RATE, SEQUENCE_DTYPE, TRANSFER_RATE, check_options,
+                         validate)
+from . import profiling
+from .online import SCHEDULERS
+
+ROTATIONAL_LATENCY = (60.0 * 1000) / (RPM * 2)   # average, ms
+TRANSFER_TIME = SECTOR_SIZE / (TRANSFER_RATE * 1000.0)   # one request, ms
+PERCENTILES = (50, 95, 99)
+
+
+class SimulationResult(NamedTuple):
+    arrival: np.ndarray         # ms, input order
+    start: np.ndarray           # ms, when the head began moving toward the request
+    finish: np.ndarray          # ms
+    response_time: np.ndarray   # finish - arrival
+    sequence: np.ndarray        # cylinders the head stopped at, starting at the head
+    total_movement: int
+    makespan: float             # finish of the last request
+    queue_times: np.ndarray     # times at which the number of outstanding requests changed
+    queue_depth: np.ndarray     # outstanding requests from queue_times[i] on
+
+
+# SATF is left out: it needs sector positions, and the simulator times
+# rotation as an average
+QUEUES = {name: scheduler for name, scheduler in SCHEDULERS.items() if name != "SATF"}
+# Policies simulate() can run with clib=True: FCFS needs no event loop and
+# DiskScheduling.c's simulate_queue runs the others
+CLIB_QUEUES = ("FCFS", "SSTF", "SCAN", "LOOK", "C-SCAN", "C-LOOK")
+
+
+def poisson_arrivals(n, rate, seed=0):
+    """Arrival times (ms) of ``n`` requests at ``rate`` requests per second."""
+    if rate <= 0:
+        raise ValueError("arrival rate must be positive")
+    rng = np.random.default_rng(seed)
+    return np.cumsum(rng.exponential(1000.0 / rate, n))
+
+
+def latency_percentiles(response_time, percentiles=PERCENTILES):
+    values = np.percentile(response_time, percentiles)
+    return {f"p{p:g}": float(v) for p, v in zip(percentiles, values)}
+
+
+def queue_depth_steps(arrival, finish):
+    """Outstanding requests over time, as (times, depth) step points: +1 at
+    each arrival, -1 at each finish."""
+    times = np.concatenate([arrival, finish])
+    deltas = np.concatenate([np.ones(arrival.size, np.int64), np.full(finish.size, -1, np.int64)])
+    order = np.lexsort((-deltas, times))
+    times = times[order]
+    depth = np.cumsum(deltas[order])
+    # Keep the last change at each instant
+    last = np.append(times[1:] != times[:-1], True)
+    return times[last], depth[last]
+
+
+def mean_queue_depth(result):
+    """Time-weighted average number of outstanding requests."""
+    times, depth = result.queue_times, result.queue_depth
+    span = times[-1] - times[0]
+    if span <= 0:
+        return float(depth.max())
+    return float(np.dot(depth[:-1], np.diff(times)) / span)
+
+
+def _fcfs_times(cylinders, arrival, head, per_request):
+    """Start and finish times (ms) and movement of FCFS, which serves one
+    request per stop in arrival order (``arrival`` ascending), so the
+    event loop unrolls into array operations."""
+    path = np.concatenate(([head], cylinders)).astype(np.int64)
+    seek = np.abs(np.diff(path))
+    service = seek * SEEK_RATE + per_request
+    # finish[i] = max(arrival[i], finish[i - 1]) + service[i], i.e. with S the
+    # running sum of service, finish[i] = S[i] + max over k <= i of
+    # (arrival[k] - S[k - 1])
+    total = np.cumsum(service)
+    finish = total + np.maximum.accumulate(arrival - (total - service))
+    start = np.maximum(arrival, np.concatenate(([-np.inf], finish[:-1])))
+    return start, finish, int(seek.sum())
+
+
+def _event_loop(scheduler, cylinders, arrival, writes, per_request):
+    """Drive an online scheduler with requests arriving at ``arrival`` (ms,
+    ascending; lists, like ``cylinders`` and ``writes``).  Returns start and
+    finish times in arrival order, the stops starting at the head, and the
+    total movement."""
+    n = len(cylinders)
+    start = [0.0] * n
+    finish = [0.0] * n
+    path = [scheduler.head]
+    movement = 0
+    # One disk means at most one pending event: the next completion, or
+    # while the disk is idle, the next arrival, so ``now`` is the whole
+    # event queue.  Arrivals are sorted and admitted in bulk each time it
+    # fires.
+    admit, dispatch, visit = scheduler.submit_many, scheduler.next, path.append
+    now = arrival[0]
+    admitted = 0
+    waiting = 0
+    while True:
+        end = bisect.bisect_right(arrival, now, admitted)
+        if end > admitted:
+            admit(cylinders[admitted:end], arrival[admitted:end], writes[admitted:end])
+            waiting += end - admitted
+            admitted = end
+        if not waiting:
+            if admitted == n:
+                break
+            now = arrival[admitted]
+            continue
+        # Head is idle: let the policy choose among everything pending now
+        pos, served, distance = dispatch(now)
+        waiting -= len(served)
+        movement += distance
+        visit(pos)
+        t = now + distance * SEEK_RATE
+        for j in served:
+            t += per_request
+            start[j] = now
+            finish[j] = t
+        now = t
+    return start, finish, path, movement
+
+
+def simulate(algorithm, requests, arrivals, head, disk_size=200, direction=1, clib=False, **options):
+    """Serve ``requests`` (cylinders) arriving at ``arrivals`` (ms) with a policy.
+
+    ``options`` are policy tunables, see algorithms.OPTIONS; ``writes`` is a
+    per-request mask marking writes.  ``clib`` runs the event loop in the
+    shared library (see disksched.clib) instead of Python, for the policies
+    it implements; FCFS has no event loop to run.
+    """
+    try:
+        scheduler_type = QUEUES[algorithm]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {algorithm}") from None
+    check_options(algorithm, options)
+    cylinders = np.asarray(requests, dtype=SEQUENCE_DTYPE)
+    arrival = np.asarray(arrivals, dtype=np.float64)
+    if cylinders.ndim != 1 or cylinders.size == 0:
+        raise ValueError("requests must be a non-empty 1-D sequence of cylinders")
+    if arrival.shape != cylinders.shape:
+        raise ValueError("arrivals must give one time per request")
+    if np.isnan(arrival).any() or (arrival < 0).any():
+        raise ValueError("arrival times must be non-negative")
+    validate(cylinders, head, disk_size)
+    if clib and algorithm not in CLIB_QUEUES:
+        raise ValueError(f"{algorithm} has no C event loop")
+
+    n = cylinders.size
+    order = np.argsort(arrival, kind="stable")
+    writes = options.pop("writes", None)
+    if writes is not None:
+        writes = np.asarray(writes, dtype=bool)
+        if writes.shape != cylinders.shape:
+            raise ValueError("writes must give one flag per request")
+    per_request = ROTATIONAL_LATENCY + TRANSFER_TIME
+
+    with profiling.phase("simulate", algorithm=algorithm, requests=n):
+        if algorithm == "FCFS":
+            start, finish, movement = _fcfs_times(cylinders[order], arrival[order], head, per_request)
+            path = np.concatenate(([head], cylinders[order]))
+        elif clib:
+            from .clib import simulate_queue
+            start, finish, path, movement = simulate_queue(
+                algorithm, cylinders[order], arrival[order], head, disk_size, direction,
+                SEEK_RATE, per_request)
+        else:
+            write_list = writes[order].tolist() if writes is not None else [False] * n
+            scheduler = scheduler_type(int(head), int(disk_size), int(direction), **options)
+            start, finish, path, movement = _event_loop(
+                scheduler, cylinders[order].tolist(), arrival[order].tolist(), write_list,
+                per_request)
+
+    # Back to input order
+    start_arr = np.empty(n)
+    finish_arr = np.empty(n)
+    start_arr[order] = start
+    finish_arr[order] = finish
+    queue_times, queue_depth = queue_depth_steps(arrival, finish_arr)
+    return SimulationResult(arrival, start_arr, finish_arr, finish_arr - arrival,
+                            np.asarray(path, dtype=SEQUENCE_DTYPE), movement,
+                            float(finish_arr.max()), queue_times, queue_depth)
+
+
+def summarize(result, percentiles=PERCENTILES):
+    """Headline numbers of a simulation as a flat dict."""
+    response = result.response_time
+    summary = {
+        "requests": int(response.size),
+        "total_movement": result.total_movement,
+        "makespan": result.makespan,
+        "throughput": response.size * 1000.0 / result.makespan if result.makespan else None,
+        "mean_response": float(response.mean()),
+        "max_response": float(response.max()),
+    }
+    summary.update(latency_percentiles(response, percentiles))
+    summary["mean_queue_depth"] = mean_queue_depth(result)
+    summary["max_queue_depth"] = int(result.queue_depth.max())
+    return summary
+
+
+def simulate_summary(algorithm, requests, arrivals, head, disk_size=200, direction=1, **options):
+    """simulate() + summarize(), for running in worker processes."""
+    return summarize(simulate(algorithm, requests, arrivals, head, disk_size, direction, **options))
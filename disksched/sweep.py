@@ -0,0 +1,242 @@
+"""Run scheduling algorithms over a grid of configurations on a process pool.
+
+A configuration is (workload, head position, direction, disk size).  Each
+pool task runs every algorithm for one configuration, so the workload is
+loaded once per worker and the best algorithm can be picked in the worker.
+Rows are streamed to a CSV or Parquet table as tasks finish.
+
+    python -m disksched.sweep trace.bin other.csv --heads 0 50 100 \\
+        --disk-sizes 200 500 --out results.csv --profile sweep.json
+
+With profiling enabled (see profiling.py) the workers' phases are sent back
+with their rows, so one Chrome trace shows every worker process.
+"""
+
+import argparse
+import csv
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from . import profiling
+from .algorithms import ALGORITHMS, schedule
+from .cache import ResultCache, requests_digest
+from .trace import load_trace
+
+FIELDS = [
+    "workload", "head", "direction", "disk_size", "algorithm",
+    "total_movement", "seek_time", "rotational_latency", "transfer_time",
+    "total_time", "best",
+]
+
+_workloads = {}  # worker side: workload name -> array or trace path
+_cache = None    # worker side: ResultCache when the sweep has a cache_dir
+
+
+def _init_worker(workloads, cache_dir=None, profile=False):
+    global _workloads, _cache
+    if profile:
+        profiling.enable()
+    _workloads = workloads
+    # Small memory LRU: sweeps rarely revisit a configuration within one worker
+    _cache = ResultCache(max_entries=16, directory=cache_dir) if cache_dir is not None else None
+    _load.cache_clear()
+
+
+def _reset_worker():
+    # After an in-process sweep, so the caller does not keep its workloads
+    global _workloads, _cache
+    _workloads = {}
+    _cache = None
+    _load.cache_clear()
+
+
+@functools.lru_cache(maxsize=4)
+def _load(name):
+    source = _workloads[name]
+    if isinstance(source, (str, os.PathLike)):
+        requests = load_trace(source)
+    else:
+        requests = np.asarray(source)
+    digest = requests_digest(requests) if _cache is not None else None
+    return requests, int(requests.min()), int(requests.max()), digest
+
+
+def _run_configuration(config, algorithms):
+    with profiling.phase("configuration", workload=config[0], head=config[1],
+                         direction=config[2], disk_size=config[3]):
+        rows = _configuration_rows(config, algorithms)
+    # Phases recorded here go back to the parent with the rows
+    return config, rows, profiling.drain()
+
+
+def _configuration_rows(config, algorithms):
+    name, head, direction, disk_size = config
+    requests, lowest, highest, digest = _load(name)
+    if lowest < 0 or highest >= disk_size:
+        return []
+
+    rows = []
+    for algo in algorithms:
+        if _cache is not None:
+            result = _cache.schedule(algo, requests, head, disk_size, direction, digest)
+        else:
+            result = schedule(algo, requests, head, disk_size, direction)
+        rows.append({
+            "workload": name, "head": head, "direction": direction,
+            "disk_size": disk_size, "algorithm": algo,
+            "total_movement": result.total_movement,
+            "seek_time": result.seek_time,
+            "rotational_latency": result.rotational_latency,
+            "transfer_time": result.transfer_time,
+            "total_time": result.total_time,
+            "best": False,
+        })
+    min(rows, key=lambda row: row["total_time"])["best"] = True
+    return rows
+
+
+def configurations(workloads, heads, directions=(1, 0), disk_sizes=(200,)):
+    for name in workloads:
+        for disk_size in disk_sizes:
+            for head in heads:
+                if head >= disk_size:
+                    continue
+                for direction in directions:
+                    yield (name, head, direction, disk_size)
+
+
+class _CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="")
+        self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+        self.writer.writeheader()
+
+    def write(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from None
+        self.pa = pa
+        self.path = path
+        self.pq = pq
+        self.writer = None
+        self.batch = []
+
+    def write(self, rows):
+        self.batch.extend(rows)
+        if len(self.batch) >= 10_000:
+            self._flush()
+
+    def _flush(self):
+        if not self.batch:
+            return
+        table = self.pa.Table.from_pylist(self.batch)
+        if self.writer is None:
+            self.writer = self.pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table)
+        self.batch = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+
+
+def open_writer(path):
+    if os.fspath(path).endswith(".parquet"):
+        return _ParquetWriter(path)
+    return _CsvWriter(path)
+
+
+def sweep(workloads, heads, directions=(1, 0), disk_sizes=(200,),
+          algorithms=tuple(ALGORITHMS), out=None, processes=None, cache_dir=None):
+    """Run every algorithm on every configuration of the grid.
+
+    ``workloads`` maps a name to a request array or a trace file path; a
+    plain list of paths is also accepted and named by basename.  Rows are
+    written to ``out`` (``.csv`` or ``.parquet``) as they complete.
+    Returns ``{(workload, head, direction, disk_size): best algorithm}``.
+    With ``processes=1`` everything runs in the calling process.  Passing
+    ``cache_dir`` reuses results stored there by earlier sweeps.
+    """
+    if not isinstance(workloads, dict):
+        workloads = {os.path.basename(os.fspath(p)): p for p in workloads}
+    configs = list(configurations(workloads, heads, directions, disk_sizes))
+    task = functools.partial(_run_configuration, algorithms=tuple(algorithms))
+    writer = open_writer(out) if out is not None else None
+    best = {}
+    pool = None
+
+    try:
+        if processes == 1:
+            _init_worker(workloads, cache_dir, profiling.enabled())
+            results = map(task, configs)
+        else:
+            pool = ProcessPoolExecutor(processes, initializer=_init_worker,
+                                       initargs=(workloads, cache_dir, profiling.enabled()))
+            workers = processes or os.cpu_count() or 1
+            # Keep configurations of one workload together so each worker's
+            # cache is reused, with enough chunks to balance the load
+            chunksize = max(1, len(configs) // (workers * 8))
+            results = pool.map(task, configs, chunksize=chunksize)
+
+        for config, rows, recorded in results:
+            profiling.extend(recorded)
+            if not rows:
+                continue
+            if writer is not None:
+                writer.write(rows)
+            best[config] = next(row["algorithm"] for row in rows if row["best"])
+    finally:
+        if writer is not None:
+            writer.close()
+        if pool is not None:
+            pool.shutdown()
+        elif processes == 1:
+            _reset_worker()
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep disk scheduling algorithms over a parameter grid")
+    parser.add_argument("traces", nargs="+", help="workload trace files (.csv/.txt or .bin/.i32)")
+    parser.add_argument("--heads", type=int, nargs="+", default=[50])
+    parser.add_argument("--directions", type=int, nargs="+", choices=[0, 1], default=[1, 0])
+    parser.add_argument("--disk-sizes", type=int, nargs="+", default=[200])
+    parser.add_argument("--algorithms", nargs="+", choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument("--out", default="sweep.csv", help="result table (.csv or .parquet)")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--cache-dir", default=None, help="reuse and store results in this directory")
+    parser.add_argument("--profile", metavar="PATH", help="write a Chrome trace of the sweep's phases")
+    args = parser.parse_args(argv)
+    if args.profile:
+        profiling.enable()
+
+    best = sweep(args.traces, args.heads, args.directions, args.disk_sizes,
+                 args.algorithms, out=args.out, processes=args.processes,
+                 cache_dir=args.cache_dir)
+    print(f"{len(best)} configurations written to {args.out}")
+    wins = {}
+    for algo in best.values():
+        wins[algo] = wins.get(algo, 0) + 1
+    for algo, count in sorted(wins.items(), key=lambda item: -item[1]):
+        print(f"{algo:<8}best in {count}")
+    if args.profile:
+        profiling.write_trace(args.profile)
+        print(profiling.format_breakdown())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Trace files: request streams too large to pass on a command line.
+
+Two formats are understood, chosen by file extension:
+
+* ``.bin`` / ``.i32`` -- packed little-endian int32 cylinders.  These are
+  memory-mapped and handed to the schedulers without a copy.
+* anything else -- CSV/whitespace separated text, with ``#`` comments.  The
+  file is memory-mapped and tokenized by NumPy straight from the mapping,
+  by the same rules as the C program: digit runs are values, a ``-`` just
+  before one is its sign and anything else separates.  Values outside
+  int32 are rejected.
+
+DiskScheduling.c reads the same formats with ``--trace <file>``.
+"""
+
+import mmap
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from . import profiling
+
+BINARY_EXTENSIONS = (".bin", ".i32")
+TRACE_DTYPE = np.dtype("<i4")
+TEXT_CHUNK = 1 << 18   # bytes of trace text tokenized at a time
+_PLACES = 10.0 ** np.arange(21)
+
+
+def is_binary_trace(path):
+    return os.path.splitext(os.fspath(path))[1].lower() in BINARY_EXTENSIONS
+
+
+def _parse_chunk(text):
+    # Digit runs are values, a '-' right before one makes it negative and
+    # everything else separates; '#' comments run to the end of the line.
+    # The digit mask is padded by one on each side so every run has both
+    # of its edges in the diff.
+    digit = np.zeros(text.size + 2, dtype=np.int8)
+    np.less(text - ord("0"), 10, out=digit[1:-1].view(bool))
+    if (text == ord("#")).any():
+        at = np.arange(text.size, dtype=np.int32)
+        last_hash = np.maximum.accumulate(np.where(text == ord("#"), at, -1))
+        last_newline = np.maximum.accumulate(np.where(text == ord("\n"), at, -1))
+        digit[1:-1] &= last_hash <= last_newline
+    edges = np.flatnonzero(np.diff(digit))
+    starts, ends = edges[::2], edges[1::2]
+
+    # Runs of each length at once: their digits as rows, times the place
+    # values.  Float64 is exact for every value in int32 range, and larger
+    # ones are rejected anyway (places past 10^20 are clipped, so long runs
+    # of zeros cannot overflow)
+    lengths = ends - starts
+    values = np.empty(starts.size)
+    for length in np.flatnonzero(np.bincount(lengths)):
+        runs = np.flatnonzero(lengths == length)
+        digits = text[starts[runs, None] + np.arange(length)] - ord("0")
+        values[runs] = digits @ _PLACES[np.minimum(np.arange(length - 1, -1, -1), _PLACES.size - 1)]
+    before = starts - 1
+    signed = (before >= 0) & (text[np.maximum(before, 0)] == ord("-"))
+    values[signed] *= -1
+
+    bad = (values < np.iinfo(TRACE_DTYPE).min) | (values > np.iinfo(TRACE_DTYPE).max)
+    if bad.any():
+        k = int(np.argmax(bad))
+        token = bytes(text[starts[k] - signed[k]:ends[k]]).decode("ascii")
+        raise ValueError(f"Trace value {token} does not fit in 32 bits")
+    return values.astype(TRACE_DTYPE)
+
+
+def _parse_text(data):
+    """Cylinders in trace text, tokenized as DiskScheduling.c does.
+
+    ``data`` is read through a NumPy view, a chunk ending at a line break at
+    a time, so parsing a memory-mapped file copies nothing but the values.
+    """
+    text = np.frombuffer(data, dtype=np.uint8)
+    # Sized as the C parser sizes it (a value takes a digit and a separator)
+    # and shrunk in place at the end, as it does with realloc
+    requests = np.empty(text.size // 2 + 1, dtype=TRACE_DTYPE)
+    n = start = 0
+    while start < text.size:
+        end = data.find(b"\n", start + TEXT_CHUNK) + 1 or text.size
+        values = _parse_chunk(text[start:end])
+        requests[n:n + values.size] = values
+        n += values.size
+        start = end
+    requests.resize(n, refcheck=False)
+    return requests
+
+
+def load_trace(path):
+    """Return the requests in ``path`` as a 1-D int32 array.
+
+    Binary traces come back as a read-only ``np.memmap`` over the file.
+    """
+    path = os.fspath(path)
+    if os.path.getsize(path) == 0:
+        raise ValueError(f"Trace file is empty: {path}")
+
+    if is_binary_trace(path):
+        if os.path.getsize(path) % TRACE_DTYPE.itemsize:
+            raise ValueError(f"Binary trace size is not a multiple of 4 bytes: {path}")
+        return np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+
+    with profiling.phase("parse trace"), open(path, "rb") as f:
+        # The mapping is left to be freed with the last view of it: after a
+        # parse error the traceback still holds some, and close() would fail
+        requests = _parse_text(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    if requests.size == 0:
+        raise ValueError(f"No requests found in trace file: {path}")
+    return requests
+
+
+def save_trace(path, requests):
+    """Write ``requests`` to ``path`` in the format implied by its extension."""
+    requests = np.asarray(requests)
+    if is_binary_trace(path):
+        requests.astype(TRACE_DTYPE, copy=False).tofile(path)
+    else:
+        np.savetxt(path, requests, fmt="%d")
+
+
+class ParsedRequests(NamedTuple):
+    requests: list
+    writes: list    # None when no request is marked as a write
+    sectors: list   # None when no request gives a sector
+
+
+def parse_request_list(text):
+    """Parse typed requests such as ``"98, 183w, 37:250"``.
+
+    ``cylinder:sector`` gives the sector for the rotational timing model and
+    a ``w`` suffix marks a write (for DEADLINE).
+    """
+    requests = []
+    writes = []
+    sectors = []
+    for item in text.split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        write = item.endswith("w")
+        if write or item.endswith("r"):
+            item = item[:-1]
+        cylinder, _, sector = item.partition(":")
+        requests.append(int(cylinder))
+        sectors.append(int(sector) if sector else None)
+        writes.append(write)
+    if all(sector is None for sector in sectors):
+        sectors = None
+    elif any(sector is None for sector in sectors):
+        raise ValueError("Give a sector for every request or for none")
+    return ParsedRequests(requests, writes if any(writes) else None, sectors)